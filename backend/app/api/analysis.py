@@ -7,7 +7,7 @@ from typing import Optional
 import logging
 
 from ..services.analysis_engine import AnalysisEngine, AnalysisEngineException
-from ..services.sentiment_analyzer import SentimentAnalyzer
+from ..services.sentiment_analyzer import sentiment_analyzer
 from ..models.analysis import AnalysisResult
 from ..models.sentiment import SentimentAnalysisResult, SentimentConflict
 from ..core.dependencies import get_current_user
@@ -19,9 +19,8 @@ logger = logging.getLogger(__name__)
 # Create router
 router = APIRouter(prefix="/analysis", tags=["analysis"])
 
-# Create analysis engine and sentiment analyzer instances
-analysis_engine = AnalysisEngine()
-sentiment_analyzer = SentimentAnalyzer()
+# Create the analysis engine; sentiment shares the module-level analyzer and its result cache
+analysis_engine = AnalysisEngine(sentiment_analyzer=sentiment_analyzer)
 
 
 @router.get("/stock/{symbol}", response_model=AnalysisResult)
@@ -278,7 +277,7 @@ async def detect_sentiment_conflicts(
             fundamental_score = 0.0
         
         # Detect conflicts
-        conflicts = await sentiment_analyzer.detect_sentiment_conflicts(
+        conflicts = sentiment_analyzer.detect_sentiment_conflicts(
             symbol, sentiment_score, fundamental_score
         )
         
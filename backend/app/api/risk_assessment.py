@@ -11,6 +11,7 @@ from typing import List, Dict, Optional, Any
 from fastapi import APIRouter, HTTPException, Query, Depends, BackgroundTasks
 from pydantic import BaseModel, Field, validator
 from datetime import datetime
+from dataclasses import asdict
 
 from ..services.risk_assessment import RiskAssessmentService, RiskAssessmentException, MarketCondition
 from ..services.data_aggregation import DataAggregationService
@@ -181,7 +182,7 @@ async def assess_portfolio_risk(
             'concentration_risk': portfolio_risk.concentration_risk,
             'correlation_risk': portfolio_risk.correlation_risk,
             'sector_concentration': portfolio_risk.sector_concentration,
-            'risk_metrics': [metric.__dict__ for metric in portfolio_risk.risk_metrics],
+            'risk_metrics': [asdict(metric) for metric in portfolio_risk.risk_metrics],
             'positions': portfolio_risk.positions,
             'assessment_timestamp': datetime.now().isoformat()
         }
@@ -9,6 +9,7 @@ from fastapi import APIRouter, HTTPException, Query, Depends
 from typing import List, Optional, Dict, Any
 import logging
 from datetime import datetime
+from functools import lru_cache
 
 from ..services.sector_analyzer import SectorAnalyzer, SectorAnalysisException
 from ..models.sector import (
@@ -63,8 +64,9 @@ class SectorListResponse(BaseModel):
 
 
 # Dependency to get sector analyzer
+@lru_cache()
 def get_sector_analyzer() -> SectorAnalyzer:
-    """Get sector analyzer instance."""
+    """Get the shared sector analyzer instance, so its sector cache spans requests."""
     return SectorAnalyzer()
 
 
@@ -22,7 +22,7 @@ from ..models.technical import TechnicalData, SignalStrength, TrendDirection
 from ..models.stock import MarketData
 from .fundamental_analyzer import FundamentalAnalyzer, FundamentalAnalysisException
 from .technical_analyzer import TechnicalAnalyzer, TechnicalAnalysisException
-from .sentiment_analyzer import SentimentAnalyzer
+from .sentiment_analyzer import SentimentAnalyzer, sentiment_analyzer as shared_sentiment_analyzer
 from .data_aggregation import DataAggregationService, DataAggregationException
 
 
@@ -60,7 +60,8 @@ class AnalysisEngine:
         self.data_service = data_service or DataAggregationService()
         self.fundamental_analyzer = fundamental_analyzer or FundamentalAnalyzer(self.data_service)
         self.technical_analyzer = technical_analyzer or TechnicalAnalyzer(self.data_service)
-        self.sentiment_analyzer = sentiment_analyzer or SentimentAnalyzer()
+        # Default to the shared analyzer so every engine reuses its sentiment result cache
+        self.sentiment_analyzer = sentiment_analyzer or shared_sentiment_analyzer
         self.executor = ThreadPoolExecutor(max_workers=4)
         
         # Recommendation thresholds
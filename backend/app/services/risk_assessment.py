@@ -10,10 +10,10 @@ import asyncio
 import numpy as np
 import pandas as pd
 from typing import List, Dict, Optional, Tuple, Any, Union
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from decimal import Decimal, ROUND_HALF_UP
 from concurrent.futures import ThreadPoolExecutor
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from enum import Enum
 
 from ..models.analysis import RiskLevel
@@ -26,6 +26,9 @@ from .data_aggregation import DataAggregationService, DataAggregationException
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Upper bound on entries held by the per-day volatility/correlation caches
+_CACHE_MAX_ENTRIES = 1024
+
 
 class MarketCondition(str, Enum):
     """Market condition scenarios for risk assessment."""
@@ -37,6 +40,91 @@ class MarketCondition(str, Enum):
     MARKET_CRASH = "market_crash"
 
 
+# Scenario impacts based on historical data, aligned with list(MarketCondition)
+_SCENARIO_CONDITIONS = tuple(MarketCondition)
+_SCENARIO_IMPACTS = {
+    MarketCondition.BULL_MARKET: {'market': 0.20, 'volatility': 0.15},
+    MarketCondition.BEAR_MARKET: {'market': -0.25, 'volatility': 0.30},
+    MarketCondition.SIDEWAYS_MARKET: {'market': 0.02, 'volatility': 0.12},
+    MarketCondition.HIGH_VOLATILITY: {'market': -0.05, 'volatility': 0.40},
+    MarketCondition.RECESSION: {'market': -0.35, 'volatility': 0.45},
+    MarketCondition.MARKET_CRASH: {'market': -0.50, 'volatility': 0.60}
+}
+_SCENARIO_MARKET_RETURNS = np.array(
+    [_SCENARIO_IMPACTS[condition]['market'] for condition in _SCENARIO_CONDITIONS],
+    dtype=np.float64
+)
+_SCENARIO_VOLATILITIES = np.array(
+    [_SCENARIO_IMPACTS[condition]['volatility'] for condition in _SCENARIO_CONDITIONS],
+    dtype=np.float64
+)
+
+_SCENARIO_DESCRIPTIONS = {
+    MarketCondition.BULL_MARKET: "In a bull market, expect {:.1%} return with strong momentum",
+    MarketCondition.BEAR_MARKET: "In a bear market, expect {:.1%} return with significant downside",
+    MarketCondition.SIDEWAYS_MARKET: "In sideways markets, expect {:.1%} return with range-bound trading",
+    MarketCondition.HIGH_VOLATILITY: "In high volatility periods, expect {:.1%} return with large price swings",
+    MarketCondition.RECESSION: "During recession, expect {:.1%} return with fundamental deterioration",
+    MarketCondition.MARKET_CRASH: "In market crash, expect {:.1%} return with severe losses"
+}
+
+# Risk levels in ascending order, plus the impact label each one carries
+_RISK_LEVELS = (RiskLevel.LOW, RiskLevel.MODERATE, RiskLevel.HIGH, RiskLevel.VERY_HIGH)
+_RISK_LEVEL_IMPACTS = {
+    RiskLevel.LOW: "Low",
+    RiskLevel.MODERATE: "Medium",
+    RiskLevel.HIGH: "High",
+    RiskLevel.VERY_HIGH: "High"
+}
+
+# RSI bands as distance from the neutral 50 line: >20 is overbought/oversold, >30 extreme
+_RSI_DISTANCE_THRESHOLDS = (20.0, 30.0)
+_RSI_RISK_DETAILS = {
+    RiskLevel.LOW: (
+        "Low",
+        "RSI of {:.1f} is in normal range",
+        "Continue monitoring momentum indicators"
+    ),
+    RiskLevel.MODERATE: (
+        "Medium",
+        "RSI of {:.1f} indicates overbought/oversold conditions",
+        "Monitor for potential reversal signals"
+    ),
+    RiskLevel.HIGH: (
+        "Medium",
+        "RSI of {:.1f} indicates extreme overbought/oversold conditions",
+        "Consider waiting for RSI to normalize before entering positions"
+    )
+}
+
+
+def _scenario_returns(beta: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Calculate expected, worst and best case returns for every scenario.
+    
+    Returns arrays aligned with _SCENARIO_CONDITIONS; the bounds are a two-sigma
+    confidence interval around the beta-adjusted market return.
+    """
+    expected_returns = _SCENARIO_MARKET_RETURNS * beta
+    spread = 2 * _SCENARIO_VOLATILITIES
+    return expected_returns, expected_returns - spread, expected_returns + spread
+
+
+def _bucket_risk_level(
+    value: float,
+    thresholds: Tuple[float, ...],
+    levels: Tuple[RiskLevel, ...] = _RISK_LEVELS,
+    side: str = "right"
+) -> RiskLevel:
+    """
+    Map a value onto a risk level using ascending bucket boundaries.
+    
+    With side="right" a value equal to a boundary falls into the bucket above it;
+    with side="left" it stays in the bucket below.
+    """
+    return levels[int(np.searchsorted(thresholds, value, side=side))]
+
+
 class RiskCategory(str, Enum):
     """Categories of risk factors."""
     MARKET_RISK = "market_risk"
@@ -47,7 +135,7 @@ class RiskCategory(str, Enum):
     CORRELATION_RISK = "correlation_risk"
 
 
-@dataclass
+@dataclass(slots=True)
 class RiskMetric:
     """Individual risk metric data."""
     name: str
@@ -58,7 +146,7 @@ class RiskMetric:
     mitigation: str
 
 
-@dataclass
+@dataclass(slots=True)
 class CorrelationData:
     """Correlation analysis data."""
     symbol: str
@@ -70,7 +158,7 @@ class CorrelationData:
     last_updated: datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class ScenarioResult:
     """Scenario analysis result."""
     scenario: MarketCondition
@@ -81,7 +169,15 @@ class ScenarioResult:
     description: str
 
 
-@dataclass
+@dataclass(slots=True)
+class RiskWarning:
+    """Risk warning with a stable tag for matching and a display message."""
+    tag: str
+    message: str
+    metric: Optional[RiskMetric] = None
+
+
+@dataclass(slots=True)
 class PortfolioRisk:
     """Portfolio-level risk assessment."""
     total_value: Decimal
@@ -117,6 +213,10 @@ class RiskAssessmentService:
         self.data_service = data_service or DataAggregationService()
         self.executor = ThreadPoolExecutor(max_workers=4)
         
+        # Per-day caches so repeat symbols within an assessment skip recomputation
+        self._volatility_cache: Dict[Tuple[str, int, date], float] = {}
+        self._correlation_cache: Dict[Tuple[str, date], CorrelationData] = {}
+        
         # Market benchmarks for correlation analysis
         self.benchmarks = {
             'SPY': 'S&P 500',
@@ -205,10 +305,10 @@ class RiskAssessmentService:
                 'symbol': symbol,
                 'overall_risk_level': overall_risk_level,
                 'risk_score': self._calculate_risk_score(risk_metrics),
-                'risk_metrics': [metric.__dict__ for metric in risk_metrics],
-                'correlation_data': correlation_data.__dict__ if correlation_data else None,
-                'scenario_analysis': [result.__dict__ for result in scenario_results] if scenario_results else None,
-                'risk_warnings': warnings,
+                'risk_metrics': [asdict(metric) for metric in risk_metrics],
+                'correlation_data': asdict(correlation_data) if correlation_data else None,
+                'scenario_analysis': [asdict(result) for result in scenario_results] if scenario_results else None,
+                'risk_warnings': [warning.message for warning in warnings],
                 'mitigation_suggestions': mitigations,
                 'assessment_timestamp': datetime.now(),
                 'data_sources': {
@@ -257,23 +357,51 @@ class RiskAssessmentService:
             # Calculate total portfolio value
             total_value = sum(Decimal(str(pos.get('value', 0))) for pos in positions)
             
-            # Assess individual position risks
-            position_risks = []
-            for position in positions:
-                symbol = position.get('symbol', '').upper()
-                if symbol:
-                    risk_assessment = await self.assess_stock_risk(
-                        symbol, include_correlation=include_correlation_matrix
-                    )
-                    position_risks.append({
-                        'symbol': symbol,
-                        'weight': float(Decimal(str(position.get('value', 0))) / total_value),
-                        'risk_assessment': risk_assessment
-                    })
+            # Assess individual position risks concurrently
+            valid_positions = [
+                (position.get('symbol', '').upper(), position)
+                for position in positions
+                if position.get('symbol', '')
+            ]
+            assessments = await asyncio.gather(
+                *(
+                    self.assess_stock_risk(symbol, include_correlation=include_correlation_matrix)
+                    for symbol, _ in valid_positions
+                ),
+                return_exceptions=True
+            )
+            
+            failures = [
+                (symbol, result)
+                for (symbol, _), result in zip(valid_positions, assessments)
+                if isinstance(result, BaseException)
+            ]
+            for symbol, error in failures:
+                logger.warning(f"Failed to assess position {symbol}: {error}")
+            if failures:
+                raise failures[0][1]
+            
+            # Normalize position values into one weight column reused below
+            weights = np.fromiter(
+                (float(position.get('value', 0)) for _, position in valid_positions),
+                dtype=np.float64,
+                count=len(valid_positions)
+            )
+            weights /= float(total_value)
+            position_risks = [
+                {
+                    'symbol': symbol,
+                    'weight': weight,
+                    'risk_assessment': risk_assessment
+                }
+                for (symbol, _), weight, risk_assessment in zip(
+                    valid_positions, weights.tolist(), assessments
+                )
+            ]
             
             # Calculate portfolio-level metrics
-            diversification_score = self._calculate_diversification_score(position_risks)
-            concentration_risk = self._calculate_concentration_risk(position_risks)
+            diversification_score = self._calculate_diversification_score(weights)
+            concentration_risk = self._calculate_concentration_risk(weights)
             sector_concentration = self._calculate_sector_concentration(positions)
             
             # Calculate correlation risk
@@ -372,18 +500,12 @@ class RiskAssessmentService:
                     return None
             
             # Determine risk level
-            if volatility >= self.risk_thresholds['volatility']['very_high']:
-                risk_level = RiskLevel.VERY_HIGH
-                impact = "High"
-            elif volatility >= self.risk_thresholds['volatility']['high']:
-                risk_level = RiskLevel.HIGH
-                impact = "High"
-            elif volatility >= self.risk_thresholds['volatility']['moderate']:
-                risk_level = RiskLevel.MODERATE
-                impact = "Medium"
-            else:
-                risk_level = RiskLevel.LOW
-                impact = "Low"
+            thresholds = self.risk_thresholds['volatility']
+            risk_level = _bucket_risk_level(
+                volatility,
+                (thresholds['moderate'], thresholds['high'], thresholds['very_high'])
+            )
+            impact = _RISK_LEVEL_IMPACTS[risk_level]
             
             return RiskMetric(
                 name="Volatility Risk",
@@ -403,18 +525,14 @@ class RiskAssessmentService:
         try:
             avg_volume = market_data.avg_volume or market_data.volume
             
-            if avg_volume >= self.risk_thresholds['liquidity']['low']:
-                risk_level = RiskLevel.LOW
-                impact = "Low"
-            elif avg_volume >= self.risk_thresholds['liquidity']['moderate']:
-                risk_level = RiskLevel.MODERATE
-                impact = "Medium"
-            elif avg_volume >= self.risk_thresholds['liquidity']['high']:
-                risk_level = RiskLevel.HIGH
-                impact = "High"
-            else:
-                risk_level = RiskLevel.VERY_HIGH
-                impact = "High"
+            # Lower volume means higher risk, so walk the levels from the top down
+            thresholds = self.risk_thresholds['liquidity']
+            risk_level = _bucket_risk_level(
+                avg_volume,
+                (thresholds['high'], thresholds['moderate'], thresholds['low']),
+                levels=_RISK_LEVELS[::-1]
+            )
+            impact = _RISK_LEVEL_IMPACTS[risk_level]
             
             return RiskMetric(
                 name="Liquidity Risk",
@@ -528,21 +646,14 @@ class RiskAssessmentService:
             if technical_data.rsi is not None:
                 rsi = float(technical_data.rsi)
                 
-                if rsi > 80 or rsi < 20:
-                    risk_level = RiskLevel.HIGH
-                    impact = "Medium"
-                    description = f"RSI of {rsi:.1f} indicates extreme overbought/oversold conditions"
-                    mitigation = "Consider waiting for RSI to normalize before entering positions"
-                elif rsi > 70 or rsi < 30:
-                    risk_level = RiskLevel.MODERATE
-                    impact = "Medium"
-                    description = f"RSI of {rsi:.1f} indicates overbought/oversold conditions"
-                    mitigation = "Monitor for potential reversal signals"
-                else:
-                    risk_level = RiskLevel.LOW
-                    impact = "Low"
-                    description = f"RSI of {rsi:.1f} is in normal range"
-                    mitigation = "Continue monitoring momentum indicators"
+                risk_level = _bucket_risk_level(
+                    abs(rsi - 50.0),
+                    _RSI_DISTANCE_THRESHOLDS,
+                    levels=_RISK_LEVELS[:3],
+                    side="left"
+                )
+                impact, description, mitigation = _RSI_RISK_DETAILS[risk_level]
+                description = description.format(rsi)
                 
                 metrics.append(RiskMetric(
                     name="Momentum Risk",
@@ -553,17 +664,19 @@ class RiskAssessmentService:
                     mitigation=mitigation
                 ))
             
-            # Support/resistance risk
+            # Support/resistance risk (float math; Decimal stays at the model boundary)
             current_price = float(market_data.price)
             
             # Check proximity to resistance
             if technical_data.resistance_levels:
-                nearest_resistance = min(
-                    technical_data.resistance_levels,
-                    key=lambda r: abs(r.level - market_data.price)
+                resistance_prices = [float(r.level) for r in technical_data.resistance_levels]
+                nearest_index = min(
+                    range(len(resistance_prices)),
+                    key=lambda i: abs(resistance_prices[i] - current_price)
                 )
+                nearest_resistance = technical_data.resistance_levels[nearest_index]
                 
-                distance_to_resistance = (float(nearest_resistance.level) - current_price) / current_price
+                distance_to_resistance = (resistance_prices[nearest_index] - current_price) / current_price
                 
                 if distance_to_resistance < 0.02:  # Within 2%
                     risk_level = RiskLevel.HIGH
@@ -639,6 +752,11 @@ class RiskAssessmentService:
     
     async def _analyze_correlations(self, symbol: str) -> Optional[CorrelationData]:
         """Analyze correlations with market benchmarks."""
+        cache_key = (symbol, date.today())
+        cached = self._correlation_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
             # For now, use SPY as primary benchmark
             # In a full implementation, this would fetch historical data and calculate correlations
@@ -650,7 +768,7 @@ class RiskAssessmentService:
             beta = 1.2  # Placeholder
             r_squared = 0.56  # Placeholder
             
-            return CorrelationData(
+            correlation_data = CorrelationData(
                 symbol=symbol,
                 benchmark=benchmark,
                 correlation=correlation,
@@ -660,6 +778,9 @@ class RiskAssessmentService:
                 last_updated=datetime.now()
             )
             
+            self._store_cached(self._correlation_cache, cache_key, correlation_data)
+            return correlation_data
+            
         except Exception as e:
             logger.warning(f"Failed to analyze correlations for {symbol}: {e}")
             return None
@@ -676,35 +797,24 @@ class RiskAssessmentService:
         try:
             beta = correlation_data.beta if correlation_data else 1.0
             
-            # Define scenario impacts based on historical data
-            scenario_impacts = {
-                MarketCondition.BULL_MARKET: {'market': 0.20, 'volatility': 0.15},
-                MarketCondition.BEAR_MARKET: {'market': -0.25, 'volatility': 0.30},
-                MarketCondition.SIDEWAYS_MARKET: {'market': 0.02, 'volatility': 0.12},
-                MarketCondition.HIGH_VOLATILITY: {'market': -0.05, 'volatility': 0.40},
-                MarketCondition.RECESSION: {'market': -0.35, 'volatility': 0.45},
-                MarketCondition.MARKET_CRASH: {'market': -0.50, 'volatility': 0.60}
-            }
+            expected_returns, worst_cases, best_cases = _scenario_returns(beta)
             
-            for condition, impact in scenario_impacts.items():
-                market_return = impact['market']
-                volatility = impact['volatility']
-                
-                # Adjust for stock's beta
-                expected_return = market_return * beta
-                
-                # Calculate confidence intervals
-                worst_case = expected_return - (2 * volatility)
-                best_case = expected_return + (2 * volatility)
-                
-                scenarios.append(ScenarioResult(
+            scenarios = [
+                ScenarioResult(
                     scenario=condition,
                     expected_return=expected_return,
                     worst_case_return=worst_case,
                     best_case_return=best_case,
                     probability=self.scenario_probabilities[condition],
                     description=self._get_scenario_description(condition, expected_return)
-                ))
+                )
+                for condition, expected_return, worst_case, best_case in zip(
+                    _SCENARIO_CONDITIONS,
+                    expected_returns.tolist(),
+                    worst_cases.tolist(),
+                    best_cases.tolist()
+                )
+            ]
             
         except Exception as e:
             logger.warning(f"Failed to perform scenario analysis for {symbol}: {e}")
@@ -713,18 +823,16 @@ class RiskAssessmentService:
     
     def _get_scenario_description(self, condition: MarketCondition, expected_return: float) -> str:
         """Get description for scenario analysis result."""
-        descriptions = {
-            MarketCondition.BULL_MARKET: f"In a bull market, expect {expected_return:.1%} return with strong momentum",
-            MarketCondition.BEAR_MARKET: f"In a bear market, expect {expected_return:.1%} return with significant downside",
-            MarketCondition.SIDEWAYS_MARKET: f"In sideways markets, expect {expected_return:.1%} return with range-bound trading",
-            MarketCondition.HIGH_VOLATILITY: f"In high volatility periods, expect {expected_return:.1%} return with large price swings",
-            MarketCondition.RECESSION: f"During recession, expect {expected_return:.1%} return with fundamental deterioration",
-            MarketCondition.MARKET_CRASH: f"In market crash, expect {expected_return:.1%} return with severe losses"
-        }
-        return descriptions.get(condition, f"Expected return: {expected_return:.1%}")
+        template = _SCENARIO_DESCRIPTIONS.get(condition, "Expected return: {:.1%}")
+        return template.format(expected_return)
     
     async def _calculate_historical_volatility(self, symbol: str, days: int = 252) -> Optional[float]:
         """Calculate historical volatility from price data."""
+        cache_key = (symbol, days, date.today())
+        cached = self._volatility_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
             # This would fetch historical price data and calculate volatility
             # For now, return a placeholder based on typical volatility ranges
@@ -736,12 +844,22 @@ class RiskAssessmentService:
             # 3. Calculate standard deviation of returns
             # 4. Annualize the volatility
             
-            return 0.25  # 25% annualized volatility placeholder
+            volatility = 0.25  # 25% annualized volatility placeholder
+            
+            self._store_cached(self._volatility_cache, cache_key, volatility)
+            return volatility
             
         except Exception as e:
             logger.warning(f"Failed to calculate historical volatility for {symbol}: {e}")
             return None
     
+    @staticmethod
+    def _store_cached(cache: Dict[Any, Any], key: Any, value: Any) -> None:
+        """Store a value in a per-day cache, dropping all entries once it is full."""
+        if len(cache) >= _CACHE_MAX_ENTRIES:
+            cache.clear()
+        cache[key] = value
+    
     def _determine_overall_risk_level(self, risk_metrics: List[RiskMetric]) -> RiskLevel:
         """Determine overall risk level from individual metrics."""
         if not risk_metrics:
@@ -781,22 +899,35 @@ class RiskAssessmentService:
         total_score = sum(risk_values[metric.risk_level] for metric in risk_metrics)
         return min(100, total_score // len(risk_metrics))
     
-    def _generate_risk_warnings(self, risk_metrics: List[RiskMetric], overall_risk: RiskLevel) -> List[str]:
-        """Generate risk warnings based on assessment."""
+    def _generate_risk_warnings(self, risk_metrics: List[RiskMetric], overall_risk: RiskLevel) -> List[RiskWarning]:
+        """Generate tagged risk warnings based on assessment."""
         warnings = []
         
         # Overall risk warning
         if overall_risk == RiskLevel.VERY_HIGH:
-            warnings.append("⚠️ VERY HIGH RISK: This investment carries significant risk of substantial losses")
+            warnings.append(RiskWarning(
+                tag="VERY_HIGH_RISK_OVERALL",
+                message="⚠️ VERY HIGH RISK: This investment carries significant risk of substantial losses"
+            ))
         elif overall_risk == RiskLevel.HIGH:
-            warnings.append("⚠️ HIGH RISK: This investment may experience significant volatility and potential losses")
+            warnings.append(RiskWarning(
+                tag="HIGH_RISK_OVERALL",
+                message="⚠️ HIGH RISK: This investment may experience significant volatility and potential losses"
+            ))
         elif overall_risk == RiskLevel.MODERATE:
-            warnings.append("⚠️ MODERATE RISK: This investment carries typical market risks")
+            warnings.append(RiskWarning(
+                tag="MODERATE_RISK_OVERALL",
+                message="⚠️ MODERATE RISK: This investment carries typical market risks"
+            ))
         
         # Specific metric warnings
         for metric in risk_metrics:
-            if metric.risk_level in [RiskLevel.HIGH, RiskLevel.VERY_HIGH]:
-                warnings.append(f"⚠️ {metric.name}: {metric.description}")
+            if metric.risk_level in (RiskLevel.HIGH, RiskLevel.VERY_HIGH):
+                warnings.append(RiskWarning(
+                    tag="HIGH_RISK_METRIC",
+                    message=f"⚠️ {metric.name}: {metric.description}",
+                    metric=metric
+                ))
         
         return warnings
     
@@ -828,7 +959,21 @@ class RiskAssessmentService:
         
         return unique_suggestions
     
-    def _calculate_diversification_score(self, position_risks: List[Dict[str, Any]]) -> int:
+    @staticmethod
+    def _position_weights(position_risks: Union[List[Dict[str, Any]], np.ndarray]) -> np.ndarray:
+        """Extract position weights as a float64 array."""
+        if isinstance(position_risks, np.ndarray):
+            return position_risks.astype(np.float64, copy=False)
+        return np.fromiter(
+            (pos['weight'] for pos in position_risks),
+            dtype=np.float64,
+            count=len(position_risks)
+        )
+    
+    def _calculate_diversification_score(
+        self,
+        position_risks: Union[List[Dict[str, Any]], np.ndarray]
+    ) -> int:
         """Calculate portfolio diversification score (0-100)."""
         if len(position_risks) <= 1:
             return 0
@@ -838,8 +983,8 @@ class RiskAssessmentService:
         base_score = min(50, num_positions * 5)  # Up to 50 points for 10+ positions
         
         # Bonus for even weight distribution
-        weights = [pos['weight'] for pos in position_risks]
-        max_weight = max(weights)
+        weights = self._position_weights(position_risks)
+        max_weight = float(weights.max())
         
         if max_weight <= 0.1:  # No position > 10%
             base_score += 30
@@ -854,19 +999,22 @@ class RiskAssessmentService:
         
         return min(100, base_score)
     
-    def _calculate_concentration_risk(self, position_risks: List[Dict[str, Any]]) -> float:
+    def _calculate_concentration_risk(
+        self,
+        position_risks: Union[List[Dict[str, Any]], np.ndarray]
+    ) -> float:
         """Calculate concentration risk (0-1, higher = more concentrated)."""
-        if not position_risks:
+        if len(position_risks) == 0:
             return 0.0
         
-        weights = [pos['weight'] for pos in position_risks]
+        weights = self._position_weights(position_risks)
         
         # Calculate Herfindahl-Hirschman Index
-        hhi = sum(w ** 2 for w in weights)
+        hhi = float(np.dot(weights, weights))
         
         # Normalize to 0-1 scale
         # HHI ranges from 1/n (perfectly diversified) to 1 (fully concentrated)
-        n = len(weights)
+        n = weights.size
         min_hhi = 1 / n
         concentration_risk = (hhi - min_hhi) / (1 - min_hhi) if n > 1 else 1.0
         
@@ -10,12 +10,13 @@ This service provides comprehensive sector and industry analysis including:
 import logging
 import asyncio
 import yfinance as yf
-from typing import List, Dict, Optional, Tuple, Any
+from typing import List, Dict, Optional, Tuple, Any, FrozenSet
 from datetime import datetime, timedelta
 from decimal import Decimal, ROUND_HALF_UP
 from concurrent.futures import ThreadPoolExecutor
 import statistics
 import numpy as np
+from dataclasses import dataclass
 
 from ..models.sector import (
     SectorCategory, SectorPerformance, IndustryPerformance, SectorRotationSignal,
@@ -29,6 +30,57 @@ from .data_aggregation import DataAggregationService, DataAggregationException
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Simulated performance multipliers applied to the average daily change, per timeframe
+_PERFORMANCE_TIMEFRAMES = ('1d', '1w', '1m', '3m', '6m', '1y', 'ytd')
+_PERFORMANCE_MULTIPLIER_LOW = np.array([1, 3, 8, 20, 35, 60, 10], dtype=np.float64)
+_PERFORMANCE_MULTIPLIER_HIGH = np.array([1, 7, 15, 40, 70, 120, 30], dtype=np.float64)
+
+# Simulated market performance ranges for the relative (vs market) timeframes
+_RELATIVE_TIMEFRAMES = ('1m', '3m', '1y')
+_RELATIVE_TIMEFRAME_INDEX = np.array([_PERFORMANCE_TIMEFRAMES.index(t) for t in _RELATIVE_TIMEFRAMES])
+_MARKET_PERFORMANCE_LOW = np.array([-5, -10, -15], dtype=np.float64)
+_MARKET_PERFORMANCE_HIGH = np.array([15, 25, 35], dtype=np.float64)
+
+# Upper bound on cached comparisons; the key includes a client-supplied timeframe
+_MAX_COMPARISON_CACHE_ENTRIES = 128
+
+
+@dataclass
+class SectorMarketData:
+    """Column-oriented view of a group's market data for vectorized aggregation."""
+    market_cap: np.ndarray  # int64, missing values as 0
+    avg_volume: np.ndarray  # float64, missing values as NaN
+    pe_ratio: np.ndarray  # float64, missing values as NaN
+    
+    @classmethod
+    def from_market_data(cls, market_data_list: List[MarketData]) -> 'SectorMarketData':
+        """Extract the aggregated columns from a list of market data in one pass."""
+        count = len(market_data_list)
+        return cls(
+            market_cap=np.fromiter(
+                (md.market_cap or 0 for md in market_data_list), dtype=np.int64, count=count
+            ),
+            avg_volume=np.fromiter(
+                (md.avg_volume or np.nan for md in market_data_list), dtype=np.float64, count=count
+            ),
+            pe_ratio=np.fromiter(
+                (float(md.pe_ratio) if md.pe_ratio else np.nan for md in market_data_list),
+                dtype=np.float64,
+                count=count
+            )
+        )
+    
+    @property
+    def total_market_cap(self) -> int:
+        """Total market capitalization, treating missing values as zero."""
+        return int(self.market_cap.sum())
+    
+    @property
+    def mean_pe_ratio(self) -> Optional[Decimal]:
+        """Average P/E ratio excluding missing values, or None if there are none."""
+        pe_ratios = self.pe_ratio[~np.isnan(self.pe_ratio)]
+        return Decimal(str(float(pe_ratios.mean()))) if pe_ratios.size else None
+
 
 class SectorAnalysisException(Exception):
     """Custom exception for sector analysis errors."""
@@ -53,6 +105,16 @@ class SectorAnalyzer:
         self.data_service = data_service or DataAggregationService()
         self.executor = ThreadPoolExecutor(max_workers=8)
         
+        # Cache settings
+        self.cache_ttl = {
+            'sector_performance': 60,  # 1 minute for sector performance
+            'sector_comparison': 60  # 1 minute for repeated comparisons
+        }
+        self._sector_cache: Dict[SectorCategory, Tuple[datetime, SectorPerformance]] = {}
+        self._comparison_cache: Dict[
+            Tuple[FrozenSet[SectorCategory], str], Tuple[datetime, SectorComparisonResult]
+        ] = {}
+        
         # Sector to stock mappings (representative stocks for each sector)
         self.sector_stocks = {
             SectorCategory.TECHNOLOGY: [
@@ -139,20 +201,18 @@ class SectorAnalyzer:
             start_time = datetime.now()
             
             # Analyze all sectors concurrently
-            sector_tasks = []
-            for sector in SectorCategory:
-                task = asyncio.create_task(self._analyze_single_sector(sector))
-                sector_tasks.append((sector, task))
+            sectors = list(SectorCategory)
+            results = await asyncio.gather(
+                *(self._analyze_single_sector(sector) for sector in sectors),
+                return_exceptions=True
+            )
             
-            # Wait for all sector analyses to complete
             sector_performances = []
-            for sector, task in sector_tasks:
-                try:
-                    performance = await task
-                    if performance:
-                        sector_performances.append(performance)
-                except Exception as e:
-                    logger.warning(f"Failed to analyze sector {sector}: {e}")
+            for sector, performance in zip(sectors, results):
+                if isinstance(performance, Exception):
+                    logger.warning(f"Failed to analyze sector {sector}: {performance}")
+                elif performance:
+                    sector_performances.append(performance)
             
             if not sector_performances:
                 raise SectorAnalysisException(
@@ -305,6 +365,14 @@ class SectorAnalyzer:
         Returns:
             Sector comparison result
         """
+        # The UI re-requests the same selection, so reuse recent results regardless of order
+        cache_key = (frozenset(sectors), timeframe)
+        cached = self._comparison_cache.get(cache_key)
+        if cached:
+            cached_at, cached_result = cached
+            if datetime.now() - cached_at <= timedelta(seconds=self.cache_ttl['sector_comparison']):
+                return cached_result.model_copy(update={'sectors': sectors})
+        
         try:
             logger.info(f"Comparing {len(sectors)} sectors over {timeframe}")
             
@@ -395,6 +463,7 @@ class SectorAnalyzer:
                 recommendations=recommendations
             )
             
+            self._cache_comparison(cache_key, result)
             logger.info(f"Sector comparison completed for {len(sectors)} sectors")
             return result
             
@@ -409,8 +478,29 @@ class SectorAnalyzer:
     
     # Private helper methods
     
+    def _cache_comparison(
+        self, cache_key: Tuple[FrozenSet[SectorCategory], str], result: SectorComparisonResult
+    ) -> None:
+        """Cache a comparison, dropping expired entries and the oldest ones beyond the cap."""
+        now = datetime.now()
+        ttl = timedelta(seconds=self.cache_ttl['sector_comparison'])
+        self._comparison_cache = {
+            key: entry for key, entry in self._comparison_cache.items()
+            if key != cache_key and now - entry[0] <= ttl
+        }
+        # Insertion order is age order, so the first keys are the oldest
+        while len(self._comparison_cache) >= _MAX_COMPARISON_CACHE_ENTRIES:
+            del self._comparison_cache[next(iter(self._comparison_cache))]
+        self._comparison_cache[cache_key] = (now, result)
+    
     async def _analyze_single_sector(self, sector: SectorCategory) -> Optional[SectorPerformance]:
         """Analyze performance of a single sector."""
+        cached = self._sector_cache.get(sector)
+        if cached:
+            cached_at, cached_performance = cached
+            if datetime.now() - cached_at <= timedelta(seconds=self.cache_ttl['sector_performance']):
+                return cached_performance
+        
         try:
             stocks = self.sector_stocks.get(sector, [])
             if not stocks:
@@ -431,7 +521,7 @@ class SectorAnalyzer:
                 return None
             
             # Calculate sector metrics
-            sector_metrics = await self._calculate_sector_metrics(market_data_list)
+            sector_metrics = self._calculate_sector_metrics(market_data_list)
             
             # Get historical performance (simulated for now)
             performance_metrics = self._calculate_performance_metrics(market_data_list)
@@ -469,6 +559,7 @@ class SectorAnalyzer:
                 dividend_yield=sector_metrics['dividend_yield']
             )
             
+            self._sector_cache[sector] = (datetime.now(), performance)
             return performance
             
         except Exception as e:
@@ -496,7 +587,7 @@ class SectorAnalyzer:
                 return None
             
             # Calculate industry metrics
-            industry_metrics = await self._calculate_industry_metrics(market_data_list)
+            industry_metrics = self._calculate_industry_metrics(market_data_list)
             
             # Get performance metrics
             performance_metrics = self._calculate_performance_metrics(market_data_list)
@@ -531,19 +622,18 @@ class SectorAnalyzer:
             logger.error(f"Failed to analyze industry {industry_name}: {e}")
             return None
     
-    async def _calculate_sector_metrics(self, market_data_list: List[MarketData]) -> Dict[str, Any]:
+    def _calculate_sector_metrics(self, market_data_list: List[MarketData]) -> Dict[str, Any]:
         """Calculate aggregated sector metrics."""
         if not market_data_list:
             return {}
         
-        # Calculate weighted averages and totals
-        total_market_cap = sum(md.market_cap or 0 for md in market_data_list)
-        total_volume = sum(md.volume for md in market_data_list)
-        avg_volume = int(statistics.mean(md.avg_volume or 0 for md in market_data_list if md.avg_volume))
+        columns = SectorMarketData.from_market_data(market_data_list)
         
-        # Calculate average P/E ratio (excluding None values)
-        pe_ratios = [float(md.pe_ratio) for md in market_data_list if md.pe_ratio]
-        avg_pe = Decimal(str(statistics.mean(pe_ratios))) if pe_ratios else None
+        # Calculate average volume (excluding missing values)
+        avg_volumes = columns.avg_volume[~np.isnan(columns.avg_volume)]
+        if not avg_volumes.size:
+            raise ValueError("No average volume data available")
+        avg_volume = int(avg_volumes.mean())
         
         # Simulated additional metrics
         volatility = Decimal(str(np.random.uniform(15, 35)))  # Simulated volatility
@@ -551,30 +641,26 @@ class SectorAnalyzer:
         dividend_yield = Decimal(str(np.random.uniform(0, 4)))  # Simulated dividend yield
         
         return {
-            'market_cap': total_market_cap,
+            'market_cap': columns.total_market_cap,
             'avg_volume': avg_volume,
-            'pe_ratio': avg_pe,
+            'pe_ratio': columns.mean_pe_ratio,
             'pb_ratio': Decimal(str(np.random.uniform(1, 5))),  # Simulated
             'volatility': volatility,
             'beta': beta,
             'dividend_yield': dividend_yield
         }
     
-    async def _calculate_industry_metrics(self, market_data_list: List[MarketData]) -> Dict[str, Any]:
+    def _calculate_industry_metrics(self, market_data_list: List[MarketData]) -> Dict[str, Any]:
         """Calculate aggregated industry metrics."""
         if not market_data_list:
             return {}
         
-        total_market_cap = sum(md.market_cap or 0 for md in market_data_list)
-        
-        # Calculate average P/E ratio
-        pe_ratios = [float(md.pe_ratio) for md in market_data_list if md.pe_ratio]
-        avg_pe = Decimal(str(statistics.mean(pe_ratios))) if pe_ratios else None
+        columns = SectorMarketData.from_market_data(market_data_list)
         
         # Simulated metrics (in production, these would come from fundamental data)
         return {
-            'market_cap': total_market_cap,
-            'pe_ratio': avg_pe,
+            'market_cap': columns.total_market_cap,
+            'pe_ratio': columns.mean_pe_ratio,
             'pb_ratio': Decimal(str(np.random.uniform(1, 6))),
             'roe': Decimal(str(np.random.uniform(0.05, 0.25))),
             'profit_margin': Decimal(str(np.random.uniform(0.05, 0.30))),
@@ -593,32 +679,24 @@ class SectorAnalyzer:
         # Use current day change as basis for simulation
         avg_change = statistics.mean(float(md.change_percent) for md in market_data_list)
         
-        # Simulate different timeframe performances
-        performance_1d = Decimal(str(avg_change))
-        performance_1w = Decimal(str(avg_change * np.random.uniform(3, 7)))
-        performance_1m = Decimal(str(avg_change * np.random.uniform(8, 15)))
-        performance_3m = Decimal(str(avg_change * np.random.uniform(20, 40)))
-        performance_6m = Decimal(str(avg_change * np.random.uniform(35, 70)))
-        performance_1y = Decimal(str(avg_change * np.random.uniform(60, 120)))
-        performance_ytd = Decimal(str(avg_change * np.random.uniform(10, 30)))
+        # Simulate every timeframe in one float draw; Decimal only at the return boundary
+        performances = avg_change * np.random.uniform(_PERFORMANCE_MULTIPLIER_LOW, _PERFORMANCE_MULTIPLIER_HIGH)
+        performances[0] = avg_change  # 1d is the observed change itself
         
         # Simulate relative performance (vs market)
-        market_performance_1m = Decimal(str(np.random.uniform(-5, 15)))
-        market_performance_3m = Decimal(str(np.random.uniform(-10, 25)))
-        market_performance_1y = Decimal(str(np.random.uniform(-15, 35)))
+        relative = performances[_RELATIVE_TIMEFRAME_INDEX] - np.random.uniform(
+            _MARKET_PERFORMANCE_LOW, _MARKET_PERFORMANCE_HIGH
+        )
         
-        return {
-            '1d': performance_1d,
-            '1w': performance_1w,
-            '1m': performance_1m,
-            '3m': performance_3m,
-            '6m': performance_6m,
-            '1y': performance_1y,
-            'ytd': performance_ytd,
-            'rel_1m': performance_1m - market_performance_1m,
-            'rel_3m': performance_3m - market_performance_3m,
-            'rel_1y': performance_1y - market_performance_1y
+        metrics = {
+            timeframe: Decimal(str(value))
+            for timeframe, value in zip(_PERFORMANCE_TIMEFRAMES, performances.tolist())
         }
+        metrics.update(
+            (f'rel_{timeframe}', Decimal(str(value)))
+            for timeframe, value in zip(_RELATIVE_TIMEFRAMES, relative.tolist())
+        )
+        return metrics
     
     def _calculate_trend_direction(self, performance_metrics: Dict[str, Decimal]) -> TrendDirection:
         """Determine trend direction based on performance."""
@@ -4,9 +4,11 @@ Integrates with NewsAPI and Reddit API to analyze market sentiment.
 """
 
 import asyncio
+import functools
 import logging
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, Union
 from decimal import Decimal
 import re
 
@@ -26,6 +28,40 @@ from ..core.config import get_settings
 
 logger = logging.getLogger(__name__)
 
+# Generic market vocabulary that marks text as stock-related
+_STOCK_TERMS = ('stock', 'share', 'equity', 'investment', 'trading', 'market')
+
+# Extreme-value alert rules as (lower, upper, alert type, description); bounds are exclusive
+# and the first rule whose range holds the overall sentiment wins
+_ALERT_RULES: Tuple[Tuple[float, float, str, str], ...] = (
+    (0.7, float('inf'), "sentiment_spike", "Strong positive sentiment detected"),
+    (float('-inf'), -0.7, "sentiment_drop", "Strong negative sentiment detected"),
+)
+
+# Upper bound on cached analyses; the key includes a client-supplied symbol
+_MAX_ANALYSIS_CACHE_ENTRIES = 256
+
+
+def _as_decimal(value: float) -> Decimal:
+    """Convert an internal float score to the Decimal the models expose."""
+    return Decimal(str(round(value, 3)))
+
+
+def _weighted_sentiment(scores: np.ndarray, weights: np.ndarray) -> float:
+    """Weighted mean of sentiment scores, or zero when nothing carries weight."""
+    total_weight = weights.sum()
+    if total_weight == 0:
+        return 0.0
+    return float(np.dot(scores, weights) / total_weight)
+
+
+@dataclass(frozen=True, slots=True)
+class _PreprocessedText:
+    """Article or post text with the lowercased view and keyword hits the scorers share."""
+    text: str
+    lower: str
+    keyword_hits: Dict[str, Tuple[str, ...]]  # keyword category -> keywords found in the text
+
 
 class SentimentAnalyzer:
     """
@@ -56,6 +92,14 @@ class SentimentAnalyzer:
             'investing', 'stocks', 'SecurityAnalysis', 'ValueInvesting',
             'StockMarket', 'financialindependence', 'SecurityAnalysis'
         ]
+        
+        # Cache settings
+        self.cache_ttl = {
+            'sentiment_analysis': 3600  # 1 hour; news and social sentiment move slowly
+        }
+        self._analysis_cache: Dict[
+            Tuple[str, int, bool], Tuple[datetime, SentimentAnalysisResult]
+        ] = {}
     
     def _initialize_clients(self):
         """Initialize API clients for news and social media."""
@@ -99,6 +143,13 @@ class SentimentAnalyzer:
         Returns:
             Complete sentiment analysis result
         """
+        cache_key = (symbol, days_back, include_social)
+        cached = self._analysis_cache.get(cache_key)
+        if cached:
+            cached_at, cached_result = cached
+            if datetime.now() - cached_at <= timedelta(seconds=self.cache_ttl['sentiment_analysis']):
+                return cached_result.model_copy()
+        
         logger.info(f"Starting sentiment analysis for {symbol}")
         
         try:
@@ -115,7 +166,7 @@ class SentimentAnalyzer:
             
             # Analyze sentiment for each data source
             news_sentiment = self._analyze_news_sentiment(news_items)
-            social_sentiment = self._analyze_social_sentiment(social_posts) if social_posts else Decimal('0')
+            social_sentiment = self._analyze_social_sentiment(social_posts) if social_posts else 0.0
             
             # Calculate overall sentiment
             overall_sentiment = self._calculate_overall_sentiment(
@@ -134,16 +185,16 @@ class SentimentAnalyzer:
             # Create sentiment data
             sentiment_data = SentimentData(
                 symbol=symbol,
-                overall_sentiment=overall_sentiment,
-                news_sentiment=news_sentiment,
-                social_sentiment=social_sentiment,
+                overall_sentiment=_as_decimal(overall_sentiment),
+                news_sentiment=_as_decimal(news_sentiment),
+                social_sentiment=_as_decimal(social_sentiment),
                 trend_direction=trend_direction,
-                trend_strength=trend_strength,
-                volatility=volatility,
+                trend_strength=_as_decimal(trend_strength),
+                volatility=_as_decimal(volatility),
                 news_articles_count=len(news_items),
                 social_posts_count=len(social_posts),
                 data_freshness=datetime.now(),
-                confidence_score=confidence_score,
+                confidence_score=_as_decimal(confidence_score),
                 sources=[SentimentSource.NEWS, SentimentSource.REDDIT] if social_posts else [SentimentSource.NEWS],
                 source_weights={
                     'news': Decimal('0.6') if social_posts else Decimal('1.0'),
@@ -154,7 +205,7 @@ class SentimentAnalyzer:
             # Generate alerts for significant sentiment changes
             alerts = await self._generate_sentiment_alerts(symbol, sentiment_data)
             
-            return SentimentAnalysisResult(
+            result = SentimentAnalysisResult(
                 symbol=symbol,
                 sentiment_data=sentiment_data,
                 recent_news=news_items[:10],  # Limit to most recent 10
@@ -164,6 +215,11 @@ class SentimentAnalyzer:
                 analysis_timestamp=datetime.now()
             )
             
+            # Don't let an outage of both sources pin an empty result for the whole TTL
+            if news_items or social_posts:
+                self._cache_analysis(cache_key, result)
+            return result
+            
         except Exception as e:
             logger.error(f"Error in sentiment analysis for {symbol}: {e}")
             # Return empty result with error indication
@@ -186,6 +242,45 @@ class SentimentAnalyzer:
                 )
             )
     
+    async def analyze_multiple_stock_sentiment(
+        self,
+        symbols: List[str],
+        days_back: int = 7,
+        include_social: bool = True
+    ) -> Dict[str, SentimentAnalysisResult]:
+        """
+        Perform sentiment analysis for multiple stock symbols concurrently.
+        
+        Args:
+            symbols: Stock symbols to analyze
+            days_back: Number of days to look back for news/posts
+            include_social: Whether to include social media analysis
+        
+        Returns:
+            Dictionary mapping symbols to sentiment analysis results
+        """
+        unique_symbols = list(dict.fromkeys(symbols))
+        results = await asyncio.gather(*(
+            self.analyze_stock_sentiment(symbol, days_back, include_social)
+            for symbol in unique_symbols
+        ))
+        return dict(zip(unique_symbols, results))
+    
+    def _cache_analysis(
+        self, cache_key: Tuple[str, int, bool], result: SentimentAnalysisResult
+    ) -> None:
+        """Cache an analysis, dropping expired entries and the oldest ones beyond the cap."""
+        now = datetime.now()
+        ttl = timedelta(seconds=self.cache_ttl['sentiment_analysis'])
+        self._analysis_cache = {
+            key: entry for key, entry in self._analysis_cache.items()
+            if key != cache_key and now - entry[0] <= ttl
+        }
+        # Insertion order is age order, so the first keys are the oldest
+        while len(self._analysis_cache) >= _MAX_ANALYSIS_CACHE_ENTRIES:
+            del self._analysis_cache[next(iter(self._analysis_cache))]
+        self._analysis_cache[cache_key] = (now, result)
+    
     async def _fetch_news_data(self, symbol: str, days_back: int) -> List[NewsItem]:
         """Fetch recent news articles for a stock symbol."""
         if not self.news_client:
@@ -197,26 +292,30 @@ class SentimentAnalyzer:
             to_date = datetime.now()
             from_date = to_date - timedelta(days=days_back)
             
-            # Search for news articles
-            articles = self.news_client.get_everything(
+            # Search for news articles off the event loop so the Reddit fetch can overlap it
+            loop = asyncio.get_event_loop()
+            articles = await loop.run_in_executor(None, functools.partial(
+                self.news_client.get_everything,
                 q=f'"{symbol}" OR stock OR shares',
                 language='en',
                 sort_by='publishedAt',
                 from_param=from_date.strftime('%Y-%m-%d'),
                 to=to_date.strftime('%Y-%m-%d'),
                 page_size=50
-            )
+            ))
             
             news_items = []
             for article in articles.get('articles', []):
                 try:
                     # Analyze sentiment for the article
-                    text = f"{article.get('title', '')} {article.get('description', '')}"
-                    sentiment_score = self._analyze_text_sentiment(text)
+                    text = self._preprocess_text(
+                        f"{article.get('title', '')} {article.get('description', '')}"
+                    )
                     relevance_score = self._calculate_relevance_score(text, symbol)
                     
-                    # Only include relevant articles
+                    # Only include relevant articles, and only run the sentiment models on those
                     if relevance_score > 0.3:
+                        sentiment_score = self._analyze_text_sentiment(text)
                         news_item = NewsItem(
                             id=f"news_{hash(article.get('url', ''))}",
                             title=article.get('title', ''),
@@ -227,8 +326,8 @@ class SentimentAnalyzer:
                             published_at=datetime.fromisoformat(
                                 article.get('publishedAt', '').replace('Z', '+00:00')
                             ),
-                            sentiment_score=sentiment_score,
-                            relevance_score=relevance_score,
+                            sentiment_score=_as_decimal(sentiment_score),
+                            relevance_score=_as_decimal(relevance_score),
                             symbols=[symbol],
                             keywords=self._extract_financial_keywords(text)
                         )
@@ -254,25 +353,28 @@ class SentimentAnalyzer:
         try:
             social_posts = []
             cutoff_date = datetime.now() - timedelta(days=days_back)
+            loop = asyncio.get_event_loop()
             
-            # Search across financial subreddits
-            for subreddit_name in self.financial_subreddits:
+            # Search the financial subreddits one at a time: the shared praw Reddit instance
+            # isn't thread-safe. praw pages results lazily, so each whole search runs in the executor
+            for subreddit_name in dict.fromkeys(self.financial_subreddits):
                 try:
-                    subreddit = self.reddit_client.subreddit(subreddit_name)
+                    submissions = await loop.run_in_executor(
+                        None, self._search_subreddit, subreddit_name, symbol
+                    )
                     
-                    # Search for posts mentioning the symbol
-                    for submission in subreddit.search(f"{symbol}", time_filter="week", limit=20):
+                    for submission in submissions:
                         created_time = datetime.fromtimestamp(submission.created_utc)
                         
                         if created_time < cutoff_date:
                             continue
                         
                         # Analyze post content
-                        text = f"{submission.title} {submission.selftext}"
-                        sentiment_score = self._analyze_text_sentiment(text)
+                        text = self._preprocess_text(f"{submission.title} {submission.selftext}")
                         relevance_score = self._calculate_relevance_score(text, symbol)
                         
                         if relevance_score > 0.4:  # Higher threshold for social media
+                            sentiment_score = self._analyze_text_sentiment(text)
                             social_post = SocialMediaPost(
                                 id=f"reddit_{submission.id}",
                                 platform="reddit",
@@ -283,8 +385,8 @@ class SentimentAnalyzer:
                                 score=submission.score,
                                 comments_count=submission.num_comments,
                                 created_at=created_time,
-                                sentiment_score=sentiment_score,
-                                relevance_score=relevance_score,
+                                sentiment_score=_as_decimal(sentiment_score),
+                                relevance_score=_as_decimal(relevance_score),
                                 symbols=[symbol]
                             )
                             social_posts.append(social_post)
@@ -300,21 +402,43 @@ class SentimentAnalyzer:
             logger.error(f"Error fetching social media data for {symbol}: {e}")
             return []
     
-    def _analyze_text_sentiment(self, text: str) -> Decimal:
+    def _search_subreddit(self, subreddit_name: str, symbol: str) -> list:
+        """Blocking Reddit search for recent posts mentioning the symbol."""
+        subreddit = self.reddit_client.subreddit(subreddit_name)
+        return list(subreddit.search(f"{symbol}", time_filter="week", limit=20))
+    
+    def _preprocess_text(self, text: Optional[str]) -> _PreprocessedText:
+        """Lowercase the text and find its financial keywords once for all scorers."""
+        text = text or ''
+        text_lower = text.lower()
+        keyword_hits = {
+            category: tuple(word for word in word_list if word in text_lower)
+            for category, word_list in self.financial_keywords.items()
+        }
+        return _PreprocessedText(text=text, lower=text_lower, keyword_hits=keyword_hits)
+    
+    def _ensure_preprocessed(self, text: Union[str, _PreprocessedText, None]) -> _PreprocessedText:
+        """Accept raw text from callers that haven't preprocessed it yet."""
+        if isinstance(text, _PreprocessedText):
+            return text
+        return self._preprocess_text(text)
+    
+    def _analyze_text_sentiment(self, text: Union[str, _PreprocessedText]) -> float:
         """
         Analyze sentiment of text using multiple approaches.
         Combines VADER and TextBlob for better accuracy.
         """
-        if not text or not text.strip():
-            return Decimal('0')
+        text = self._ensure_preprocessed(text)
+        if not text.text.strip():
+            return 0.0
         
         try:
             # VADER sentiment (good for social media)
-            vader_scores = self.vader_analyzer.polarity_scores(text)
+            vader_scores = self.vader_analyzer.polarity_scores(text.text)
             vader_compound = vader_scores['compound']
             
             # TextBlob sentiment (good for formal text)
-            blob = TextBlob(text)
+            blob = TextBlob(text.text)
             textblob_polarity = blob.sentiment.polarity
             
             # Combine scores with weights
@@ -328,33 +452,32 @@ class SentimentAnalyzer:
             # Clamp to [-1, 1] range
             final_score = max(-1, min(1, final_score))
             
-            return Decimal(str(round(final_score, 3)))
+            return round(final_score, 3)
             
         except Exception as e:
             logger.warning(f"Error analyzing text sentiment: {e}")
-            return Decimal('0')
+            return 0.0
     
-    def _calculate_keyword_sentiment_boost(self, text: str) -> float:
+    def _calculate_keyword_sentiment_boost(self, text: _PreprocessedText) -> float:
         """Calculate sentiment boost based on financial keywords."""
-        text_lower = text.lower()
-        
-        positive_count = sum(1 for word in self.financial_keywords['positive'] if word in text_lower)
-        negative_count = sum(1 for word in self.financial_keywords['negative'] if word in text_lower)
+        positive_count = len(text.keyword_hits['positive'])
+        negative_count = len(text.keyword_hits['negative'])
         
         # Calculate boost (max ±0.2)
         total_keywords = positive_count + negative_count
         if total_keywords == 0:
-            return 0
+            return 0.0
         
         boost = (positive_count - negative_count) / total_keywords * 0.2
         return boost
     
-    def _calculate_relevance_score(self, text: str, symbol: str) -> Decimal:
+    def _calculate_relevance_score(self, text: Union[str, _PreprocessedText], symbol: str) -> float:
         """Calculate how relevant the text is to the stock symbol."""
-        if not text:
-            return Decimal('0')
+        text = self._ensure_preprocessed(text)
+        if not text.text:
+            return 0.0
         
-        text_lower = text.lower()
+        text_lower = text.lower
         symbol_lower = symbol.lower()
         
         relevance_score = 0.0
@@ -364,142 +487,102 @@ class SentimentAnalyzer:
             relevance_score += 0.5
         
         # Financial keywords
-        financial_word_count = sum(
-            1 for word_list in self.financial_keywords.values()
-            for word in word_list
-            if word in text_lower
-        )
+        financial_word_count = sum(len(hits) for hits in text.keyword_hits.values())
         relevance_score += min(financial_word_count * 0.1, 0.4)
         
         # Stock-related terms
-        stock_terms = ['stock', 'share', 'equity', 'investment', 'trading', 'market']
-        stock_term_count = sum(1 for term in stock_terms if term in text_lower)
+        stock_term_count = sum(1 for term in _STOCK_TERMS if term in text_lower)
         relevance_score += min(stock_term_count * 0.05, 0.2)
         
-        return Decimal(str(min(relevance_score, 1.0)))
+        return min(relevance_score, 1.0)
     
-    def _extract_financial_keywords(self, text: str) -> List[str]:
+    def _extract_financial_keywords(self, text: Union[str, _PreprocessedText]) -> List[str]:
         """Extract financial keywords from text."""
-        if not text:
-            return []
-        
-        text_lower = text.lower()
-        found_keywords = []
-        
-        for word_list in self.financial_keywords.values():
-            for word in word_list:
-                if word in text_lower:
-                    found_keywords.append(word)
-        
-        return list(set(found_keywords))  # Remove duplicates
+        text = self._ensure_preprocessed(text)
+        found_keywords = (word for hits in text.keyword_hits.values() for word in hits)
+        return list(dict.fromkeys(found_keywords))  # Remove duplicates
     
-    def _analyze_news_sentiment(self, news_items: List[NewsItem]) -> Decimal:
+    def _analyze_news_sentiment(self, news_items: List[NewsItem]) -> float:
         """Calculate overall news sentiment."""
         if not news_items:
-            return Decimal('0')
-        
-        # Weight recent news more heavily
-        total_weighted_sentiment = Decimal('0')
-        total_weight = Decimal('0')
+            return 0.0
         
         now = datetime.now()
+        count = len(news_items)
+        hours_old = np.fromiter(
+            ((now - item.published_at).total_seconds() / 3600 for item in news_items), float, count
+        )
+        relevance = np.fromiter((item.relevance_score for item in news_items), float, count)
+        scores = np.fromiter((item.sentiment_score for item in news_items), float, count)
         
-        for item in news_items:
-            # Calculate time-based weight (more recent = higher weight)
-            hours_old = (now - item.published_at).total_seconds() / 3600
-            time_weight = max(0.1, 1.0 - (hours_old / 168))  # Decay over 1 week
-            
-            # Apply relevance weight
-            relevance_weight = float(item.relevance_score)
-            
-            # Combined weight
-            weight = Decimal(str(time_weight * relevance_weight))
-            
-            total_weighted_sentiment += item.sentiment_score * weight
-            total_weight += weight
-        
-        if total_weight == 0:
-            return Decimal('0')
+        # Weight recent news more heavily (decay over 1 week), scaled by relevance
+        weights = np.maximum(0.1, 1.0 - hours_old / 168) * relevance
         
-        return total_weighted_sentiment / total_weight
+        return _weighted_sentiment(scores, weights)
     
-    def _analyze_social_sentiment(self, social_posts: List[SocialMediaPost]) -> Decimal:
+    def _analyze_social_sentiment(self, social_posts: List[SocialMediaPost]) -> float:
         """Calculate overall social media sentiment."""
         if not social_posts:
-            return Decimal('0')
-        
-        # Weight posts by engagement (score/upvotes)
-        total_weighted_sentiment = Decimal('0')
-        total_weight = Decimal('0')
+            return 0.0
         
-        for post in social_posts:
-            # Use post score as weight (with minimum weight)
-            engagement_weight = max(1, post.score or 1)
-            relevance_weight = float(post.relevance_score)
-            
-            weight = Decimal(str(engagement_weight * relevance_weight))
-            
-            total_weighted_sentiment += post.sentiment_score * weight
-            total_weight += weight
+        count = len(social_posts)
+        engagement = np.fromiter((post.score or 1 for post in social_posts), float, count)
+        relevance = np.fromiter((post.relevance_score for post in social_posts), float, count)
+        scores = np.fromiter((post.sentiment_score for post in social_posts), float, count)
         
-        if total_weight == 0:
-            return Decimal('0')
+        # Weight posts by engagement (score/upvotes, with minimum weight), scaled by relevance
+        weights = np.maximum(1, engagement) * relevance
         
-        return total_weighted_sentiment / total_weight
+        return _weighted_sentiment(scores, weights)
     
     def _calculate_overall_sentiment(
         self, 
-        news_sentiment: Decimal, 
-        social_sentiment: Decimal,
+        news_sentiment: float, 
+        social_sentiment: float,
         news_count: int,
         social_count: int
-    ) -> Decimal:
+    ) -> float:
         """Calculate overall sentiment combining news and social media."""
         if news_count == 0 and social_count == 0:
-            return Decimal('0')
+            return 0.0
         
-        # Weight based on data availability and reliability
-        news_weight = Decimal('0.7') if news_count > 0 else Decimal('0')
-        social_weight = Decimal('0.3') if social_count > 0 else Decimal('0')
+        # A single available source carries the full weight
+        if social_count == 0:
+            return news_sentiment
+        if news_count == 0:
+            return social_sentiment
         
-        # Adjust weights if only one source is available
-        total_weight = news_weight + social_weight
-        if total_weight > 0:
-            news_weight = news_weight / total_weight
-            social_weight = social_weight / total_weight
-        
-        overall = (news_sentiment * news_weight) + (social_sentiment * social_weight)
-        return overall
+        # Weight based on reliability: news 70%, social 30%
+        return 0.7 * news_sentiment + 0.3 * social_sentiment
     
     def _analyze_sentiment_trend(
         self, 
         items: List[NewsItem | SocialMediaPost]
-    ) -> Tuple[TrendDirection, Decimal]:
+    ) -> Tuple[TrendDirection, float]:
         """Analyze sentiment trend over time."""
         if len(items) < 3:
-            return TrendDirection.STABLE, Decimal('0')
-        
-        # Sort by timestamp
-        sorted_items = sorted(items, key=lambda x: x.published_at if hasattr(x, 'published_at') else x.created_at)
+            return TrendDirection.STABLE, 0.0
         
         # Calculate sentiment over time periods
         now = datetime.now()
-        recent_items = [item for item in sorted_items 
-                       if (now - (item.published_at if hasattr(item, 'published_at') else item.created_at)).days <= 2]
-        older_items = [item for item in sorted_items 
-                      if (now - (item.published_at if hasattr(item, 'published_at') else item.created_at)).days > 2]
-        
-        if not recent_items or not older_items:
-            return TrendDirection.STABLE, Decimal('0')
+        count = len(items)
+        timestamps = (
+            item.published_at if hasattr(item, 'published_at') else item.created_at
+            for item in items
+        )
+        age_seconds = np.fromiter(((now - ts).total_seconds() for ts in timestamps), float, count)
+        scores = np.fromiter((item.sentiment_score for item in items), float, count)
         
-        recent_sentiment = sum(item.sentiment_score for item in recent_items) / len(recent_items)
-        older_sentiment = sum(item.sentiment_score for item in older_items) / len(older_items)
+        # Recent means at most two whole days old, i.e. timedelta.days <= 2
+        recent = age_seconds < 3 * 86400
+        if recent.all() or not recent.any():
+            return TrendDirection.STABLE, 0.0
         
-        sentiment_change = recent_sentiment - older_sentiment
+        sentiment_change = float(scores[recent].mean() - scores[~recent].mean())
         change_magnitude = abs(sentiment_change)
         
         # Determine trend direction
-        if change_magnitude < Decimal('0.1'):
+        if change_magnitude < 0.1:
             direction = TrendDirection.STABLE
         elif sentiment_change > 0:
             direction = TrendDirection.IMPROVING
@@ -507,21 +590,21 @@ class SentimentAnalyzer:
             direction = TrendDirection.DECLINING
         
         # Check for volatility
-        if change_magnitude > Decimal('0.3'):
+        if change_magnitude > 0.3:
             direction = TrendDirection.VOLATILE
         
-        return direction, min(change_magnitude, Decimal('1'))
+        return direction, min(change_magnitude, 1.0)
     
     def _calculate_confidence_score(
         self, 
         news_items: List[NewsItem], 
         social_posts: List[SocialMediaPost]
-    ) -> Decimal:
+    ) -> float:
         """Calculate confidence in sentiment analysis."""
         total_items = len(news_items) + len(social_posts)
         
         if total_items == 0:
-            return Decimal('0')
+            return 0.0
         
         # Base confidence on data volume
         volume_score = min(total_items / 20, 1.0)  # Max confidence at 20+ items
@@ -537,20 +620,18 @@ class SentimentAnalyzer:
         
         # Combine scores
         confidence = (volume_score * 0.6) + (quality_score * 0.4)
-        return Decimal(str(round(confidence, 3)))
+        return round(confidence, 3)
     
     def _calculate_sentiment_volatility(
         self, 
         items: List[NewsItem | SocialMediaPost]
-    ) -> Decimal:
+    ) -> float:
         """Calculate sentiment volatility."""
         if len(items) < 2:
-            return Decimal('0')
+            return 0.0
         
-        sentiments = [float(item.sentiment_score) for item in items]
-        volatility = np.std(sentiments) if len(sentiments) > 1 else 0
-        
-        return Decimal(str(round(volatility, 3)))
+        sentiments = np.fromiter((item.sentiment_score for item in items), float, len(items))
+        return round(float(sentiments.std()), 3)
     
     async def _generate_sentiment_alerts(
         self, 
@@ -562,25 +643,26 @@ class SentimentAnalyzer:
         
         # This would typically compare with historical data
         # For now, generate alerts based on extreme values
+        overall_sentiment = float(sentiment_data.overall_sentiment)
         
-        if abs(sentiment_data.overall_sentiment) > Decimal('0.7'):
-            alert_type = "sentiment_spike" if sentiment_data.overall_sentiment > 0 else "sentiment_drop"
-            
-            alert = SentimentAlert(
-                symbol=symbol,
-                alert_type=alert_type,
-                current_sentiment=sentiment_data.overall_sentiment,
-                previous_sentiment=Decimal('0'),  # Would be from historical data
-                change_magnitude=abs(sentiment_data.overall_sentiment),
-                trigger_time=datetime.now(),
-                description=f"Strong {'positive' if sentiment_data.overall_sentiment > 0 else 'negative'} sentiment detected",
-                confidence=sentiment_data.confidence_score
-            )
-            alerts.append(alert)
+        for lower, upper, alert_type, description in _ALERT_RULES:
+            if lower < overall_sentiment < upper:
+                alert = SentimentAlert(
+                    symbol=symbol,
+                    alert_type=alert_type,
+                    current_sentiment=sentiment_data.overall_sentiment,
+                    previous_sentiment=Decimal('0'),  # Would be from historical data
+                    change_magnitude=abs(sentiment_data.overall_sentiment),
+                    trigger_time=datetime.now(),
+                    description=description,
+                    confidence=sentiment_data.confidence_score
+                )
+                alerts.append(alert)
+                break
         
         return alerts
     
-    async def detect_sentiment_conflicts(
+    def detect_sentiment_conflicts(
         self, 
         symbol: str, 
         sentiment_score: Decimal, 
@@ -16,10 +16,16 @@ from typing import List, Dict, Any
 class TestRunner:
     """Test runner with different test suites and reporting."""
     
-    def __init__(self):
+    def __init__(self, workers: str = None):
         self.project_root = Path(__file__).parent
+        self.workers = workers
         self.results = {}
     
+    def _parallel_args(self) -> List[str]:
+        """pytest-xdist arguments for suites that are safe to run in parallel."""
+        # loadfile keeps each module on one worker so class/module fixtures are built once
+        return ["-n", self.workers, "--dist=loadfile"] if self.workers else []
+    
     def run_unit_tests(self, verbose: bool = False) -> bool:
         """Run unit tests."""
         print("🧪 Running unit tests...")
@@ -34,7 +40,8 @@ class TestRunner:
             "--cov-report=xml:coverage-unit.xml",
             "--junit-xml=test-results-unit.xml",
             "-m", "unit and not slow",
-            "--tb=short"
+            "--tb=short",
+            *self._parallel_args()
         ]
         
         result = subprocess.run(cmd, cwd=self.project_root)
@@ -92,6 +99,14 @@ class TestRunner:
             "--tb=short"
         ]
         
+        # Assert regressions against a saved run instead of absolute timings
+        baseline = os.environ.get('BENCHMARK_BASELINE')
+        if baseline:
+            cmd.extend([
+                f"--benchmark-compare={baseline}",
+                "--benchmark-compare-fail=mean:10%"
+            ])
+        
         result = subprocess.run(cmd, cwd=self.project_root)
         success = result.returncode == 0
         
@@ -321,6 +336,10 @@ def main():
         action="store_true",
         help="Verbose output"
     )
+    parser.add_argument(
+        "--workers", "-n",
+        help="Run unit tests in parallel with pytest-xdist (e.g. 'auto' or a worker count)"
+    )
     parser.add_argument(
         "--skip-slow",
         action="store_true",
@@ -329,7 +348,7 @@ def main():
     
     args = parser.parse_args()
     
-    runner = TestRunner()
+    runner = TestRunner(workers=args.workers)
     
     if args.suite == "unit":
         success = runner.run_unit_tests(args.verbose)
@@ -147,7 +147,7 @@ class SentimentAnalysisDemo:
         ]
         
         for scenario_name, fundamental_score in scenarios:
-            conflicts = await self.analyzer.detect_sentiment_conflicts(
+            conflicts = self.analyzer.detect_sentiment_conflicts(
                 symbol, sentiment_score, fundamental_score
             )
             
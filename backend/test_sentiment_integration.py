@@ -203,7 +203,7 @@ async def test_sentiment_conflict_detection():
     analyzer = SentimentAnalyzer()
     
     # Test bullish sentiment vs bearish fundamentals
-    conflicts = await analyzer.detect_sentiment_conflicts(
+    conflicts = analyzer.detect_sentiment_conflicts(
         "TSLA", Decimal('0.8'), Decimal('-0.7')
     )
     
@@ -213,7 +213,7 @@ async def test_sentiment_conflict_detection():
     assert conflicts[0].conflict_severity > Decimal('0.5')
     
     # Test bearish sentiment vs bullish fundamentals
-    conflicts = await analyzer.detect_sentiment_conflicts(
+    conflicts = analyzer.detect_sentiment_conflicts(
         "MSFT", Decimal('-0.6'), Decimal('0.8')
     )
     
@@ -222,7 +222,7 @@ async def test_sentiment_conflict_detection():
     assert conflicts[0].symbol == "MSFT"
     
     # Test no conflict (aligned sentiment and fundamentals)
-    conflicts = await analyzer.detect_sentiment_conflicts(
+    conflicts = analyzer.detect_sentiment_conflicts(
         "GOOGL", Decimal('0.5'), Decimal('0.6')
     )
     
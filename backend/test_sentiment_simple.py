@@ -169,7 +169,7 @@ async def test_sentiment_analyzer():
     # Test conflict detection
     print("\n10. Testing conflict detection:")
     
-    conflicts = await analyzer.detect_sentiment_conflicts(
+    conflicts = analyzer.detect_sentiment_conflicts(
         "AAPL", Decimal('0.7'), Decimal('-0.6')
     )
     print(f"Detected conflicts: {len(conflicts)}")
@@ -2,6 +2,8 @@
 Pytest configuration and fixtures for testing.
 """
 
+import os
+import platform
 import pytest
 from typing import Generator, Dict
 from fastapi.testclient import TestClient
@@ -15,10 +17,13 @@ from app.models.user import User
 from app.models.watchlist import Watchlist, WatchlistItem
 from app.services.auth_service import AuthService
 from app.schemas.auth import UserCreate
-from main import app
 
-# Test database URL (SQLite in memory)
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test_settlers_of_stock.db"
+# Test database URL (SQLite file, one per pytest-xdist worker so parallel runs don't collide)
+_XDIST_WORKER = os.getenv("PYTEST_XDIST_WORKER", "")
+SQLALCHEMY_DATABASE_URL = (
+    f"sqlite:///./test_settlers_of_stock_{_XDIST_WORKER}.db"
+    if _XDIST_WORKER else "sqlite:///./test_settlers_of_stock.db"
+)
 
 # Create test engine
 engine = create_engine(
@@ -30,6 +35,26 @@ engine = create_engine(
 # Create test session factory
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# pytest.ini uses a [tool:pytest] header, which pytest doesn't read from that file, so the
+# markers are registered here to keep `-m` selection and the class-level marks warning-free
+_MARKERS = (
+    "unit: Unit tests",
+    "integration: Integration tests",
+    "slow: Slow running tests (>5 seconds)",
+    "api: API endpoint tests",
+    "database: Database operation tests",
+    "external: Tests requiring external services",
+    "performance: Performance and load tests",
+    "loadtest: Out-of-process load tests against a running server (requires wrk)",
+    "smoke: Quick in-process sanity checks",
+)
+
+
+def pytest_configure(config):
+    """Register the project's test markers."""
+    for marker in _MARKERS:
+        config.addinivalue_line("markers", marker)
+
 
 @pytest.fixture(scope="session")
 def db_engine():
@@ -56,6 +81,8 @@ def db_session(db_engine) -> Generator[Session, None, None]:
 @pytest.fixture(scope="function")
 def client(db_session: Session) -> Generator[TestClient, None, None]:
     """Create a test client with database session override."""
+    # Deferred so collecting or running tests that never touch the app doesn't build it
+    from main import app
     
     def override_get_db():
         try:
@@ -183,6 +210,34 @@ def multiple_users(db_session: Session) -> list[User]:
     return users
 
 
+@pytest.fixture(scope="session")
+def perf_budget() -> float:
+    """
+    Scale factor for wall-clock thresholds in performance tests.
+
+    Starts from PERF_BUDGET_SCALE (default 1.0) and widens the budget when the
+    host is already loaded or is not a typical x86_64 runner, so absolute
+    timing assertions stay meaningful on slow or shared CI machines.
+    """
+    scale = float(os.getenv("PERF_BUDGET_SCALE", "1.0"))
+    
+    cpu_count = os.cpu_count() or 1
+    try:
+        load_1m = os.getloadavg()[0]
+    except (AttributeError, OSError):
+        load_1m = 0.0
+    
+    # Saturated hosts get proportionally more time
+    if load_1m > cpu_count:
+        scale *= load_1m / cpu_count
+    
+    # Emulated/ARM runners are typically slower than the baseline hardware
+    if platform.machine().lower() not in ("x86_64", "amd64"):
+        scale *= 2.0
+    
+    return scale
+
+
 # Mock data fixtures
 @pytest.fixture
 def sample_user_preferences():
@@ -32,6 +32,12 @@ def pytest_configure(config):
     config.addinivalue_line(
         "markers", "performance: Performance and benchmark tests"
     )
+    config.addinivalue_line(
+        "markers", "loadtest: Out-of-process load tests against a running server (requires wrk)"
+    )
+    config.addinivalue_line(
+        "markers", "smoke: Quick in-process sanity checks"
+    )
 
 
 def pytest_collection_modifyitems(config, items):
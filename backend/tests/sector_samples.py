@@ -0,0 +1,37 @@
+"""
+Sample sector data shared by the sector analyzer and sector API tests.
+"""
+
+from decimal import Decimal
+from types import MappingProxyType
+
+from app.models.sector import SectorCategory, TrendDirection
+
+
+# Keyword arguments for a fully populated Technology SectorPerformance
+SECTOR_PERFORMANCE_FIELDS = MappingProxyType({
+    "sector": SectorCategory.TECHNOLOGY,
+    "performance_1d": Decimal("1.2"),
+    "performance_1w": Decimal("3.5"),
+    "performance_1m": Decimal("8.7"),
+    "performance_3m": Decimal("15.2"),
+    "performance_6m": Decimal("22.1"),
+    "performance_1y": Decimal("28.5"),
+    "performance_ytd": Decimal("18.3"),
+    "relative_performance_1m": Decimal("2.1"),
+    "relative_performance_3m": Decimal("4.8"),
+    "relative_performance_1y": Decimal("8.2"),
+    "trend_direction": TrendDirection.UP,
+    "trend_strength": 75,
+    "momentum_score": 82,
+    "market_cap": 15000000000000,
+    "avg_volume": 2500000000,
+    "pe_ratio": Decimal("28.5"),
+    "pb_ratio": Decimal("4.2"),
+    "performance_rank_1m": 2,
+    "performance_rank_3m": 1,
+    "performance_rank_1y": 3,
+    "volatility": Decimal("24.5"),
+    "beta": Decimal("1.15"),
+    "dividend_yield": Decimal("1.2"),
+})
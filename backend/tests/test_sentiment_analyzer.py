@@ -7,6 +7,8 @@ from unittest.mock import Mock, patch, AsyncMock
 from datetime import datetime, timedelta
 from decimal import Decimal
 
+from praw.models import Submission
+
 from app.services.sentiment_analyzer import SentimentAnalyzer
 from app.models.sentiment import (
     NewsItem, SocialMediaPost, SentimentData, SentimentAnalysisResult,
@@ -28,9 +30,10 @@ class TestSentimentAnalyzer:
             analyzer = SentimentAnalyzer()
             return analyzer
     
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def sample_news_items(self):
-        """Create sample news items for testing."""
+        """Create sample news items shared by the class; tests that mutate them take copies."""
+        now = datetime.now()
         return [
             NewsItem(
                 id="news_1",
@@ -38,7 +41,7 @@ class TestSentimentAnalyzer:
                 summary="Apple reports better than expected quarterly results",
                 url="https://example.com/news1",
                 source="Financial Times",
-                published_at=datetime.now() - timedelta(hours=2),
+                published_at=now - timedelta(hours=2),
                 sentiment_score=Decimal('0.8'),
                 relevance_score=Decimal('0.9'),
                 symbols=["AAPL"],
@@ -50,7 +53,7 @@ class TestSentimentAnalyzer:
                 summary="New regulations may impact Apple's business model",
                 url="https://example.com/news2",
                 source="Reuters",
-                published_at=datetime.now() - timedelta(hours=6),
+                published_at=now - timedelta(hours=6),
                 sentiment_score=Decimal('-0.4'),
                 relevance_score=Decimal('0.7'),
                 symbols=["AAPL"],
@@ -58,9 +61,10 @@ class TestSentimentAnalyzer:
             )
         ]
     
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def sample_social_posts(self):
-        """Create sample social media posts for testing."""
+        """Create sample social media posts shared by the class."""
+        now = datetime.now()
         return [
             SocialMediaPost(
                 id="reddit_1",
@@ -71,7 +75,7 @@ class TestSentimentAnalyzer:
                 subreddit="stocks",
                 score=25,
                 comments_count=10,
-                created_at=datetime.now() - timedelta(hours=1),
+                created_at=now - timedelta(hours=1),
                 sentiment_score=Decimal('0.7'),
                 relevance_score=Decimal('0.8'),
                 symbols=["AAPL"]
@@ -85,7 +89,7 @@ class TestSentimentAnalyzer:
                 subreddit="investing",
                 score=15,
                 comments_count=5,
-                created_at=datetime.now() - timedelta(hours=4),
+                created_at=now - timedelta(hours=4),
                 sentiment_score=Decimal('-0.3'),
                 relevance_score=Decimal('0.6'),
                 symbols=["AAPL"]
@@ -95,7 +99,8 @@ class TestSentimentAnalyzer:
     def test_analyze_text_sentiment_positive(self, sentiment_analyzer):
         """Test sentiment analysis for positive text."""
         positive_text = "This stock is performing excellently with strong growth and profits"
-        sentiment = sentiment_analyzer._analyze_text_sentiment(positive_text)
+        preprocessed = sentiment_analyzer._preprocess_text(positive_text)
+        sentiment = sentiment_analyzer._analyze_text_sentiment(preprocessed)
         
         assert sentiment > 0
         assert -1 <= sentiment <= 1
@@ -103,7 +108,8 @@ class TestSentimentAnalyzer:
     def test_analyze_text_sentiment_negative(self, sentiment_analyzer):
         """Test sentiment analysis for negative text."""
         negative_text = "The company is facing losses and declining performance"
-        sentiment = sentiment_analyzer._analyze_text_sentiment(negative_text)
+        preprocessed = sentiment_analyzer._preprocess_text(negative_text)
+        sentiment = sentiment_analyzer._analyze_text_sentiment(preprocessed)
         
         assert sentiment < 0
         assert -1 <= sentiment <= 1
@@ -111,23 +117,27 @@ class TestSentimentAnalyzer:
     def test_analyze_text_sentiment_neutral(self, sentiment_analyzer):
         """Test sentiment analysis for neutral text."""
         neutral_text = "The company reported quarterly results"
-        sentiment = sentiment_analyzer._analyze_text_sentiment(neutral_text)
+        preprocessed = sentiment_analyzer._preprocess_text(neutral_text)
+        sentiment = sentiment_analyzer._analyze_text_sentiment(preprocessed)
         
         assert abs(sentiment) < 0.3  # Should be relatively neutral
         assert -1 <= sentiment <= 1
     
     def test_analyze_text_sentiment_empty(self, sentiment_analyzer):
         """Test sentiment analysis for empty text."""
-        sentiment = sentiment_analyzer._analyze_text_sentiment("")
+        preprocessed = sentiment_analyzer._preprocess_text("")
+        sentiment = sentiment_analyzer._analyze_text_sentiment(preprocessed)
         assert sentiment == Decimal('0')
         
-        sentiment = sentiment_analyzer._analyze_text_sentiment(None)
+        preprocessed = sentiment_analyzer._preprocess_text(None)
+        sentiment = sentiment_analyzer._analyze_text_sentiment(preprocessed)
         assert sentiment == Decimal('0')
     
     def test_calculate_relevance_score_high(self, sentiment_analyzer):
         """Test relevance calculation for highly relevant text."""
         text = "AAPL stock price increased after strong earnings report"
-        relevance = sentiment_analyzer._calculate_relevance_score(text, "AAPL")
+        preprocessed = sentiment_analyzer._preprocess_text(text)
+        relevance = sentiment_analyzer._calculate_relevance_score(preprocessed, "AAPL")
         
         assert relevance > Decimal('0.5')
         assert 0 <= relevance <= 1
@@ -135,7 +145,8 @@ class TestSentimentAnalyzer:
     def test_calculate_relevance_score_low(self, sentiment_analyzer):
         """Test relevance calculation for low relevance text."""
         text = "The weather is nice today"
-        relevance = sentiment_analyzer._calculate_relevance_score(text, "AAPL")
+        preprocessed = sentiment_analyzer._preprocess_text(text)
+        relevance = sentiment_analyzer._calculate_relevance_score(preprocessed, "AAPL")
         
         assert relevance < Decimal('0.3')
         assert 0 <= relevance <= 1
@@ -143,13 +154,27 @@ class TestSentimentAnalyzer:
     def test_extract_financial_keywords(self, sentiment_analyzer):
         """Test financial keyword extraction."""
         text = "The company showed strong profit growth and beat earnings expectations"
-        keywords = sentiment_analyzer._extract_financial_keywords(text)
+        preprocessed = sentiment_analyzer._preprocess_text(text)
+        keywords = sentiment_analyzer._extract_financial_keywords(preprocessed)
         
         assert "profit" in keywords
         assert "growth" in keywords
         assert "beat" in keywords
         assert len(keywords) > 0
     
+    def test_text_helpers_accept_raw_strings(self, sentiment_analyzer):
+        """Test the text helpers preprocess plain strings themselves."""
+        text = "AAPL stock shows strong profit growth and beat earnings expectations"
+        preprocessed = sentiment_analyzer._preprocess_text(text)
+        
+        sentiment = sentiment_analyzer._analyze_text_sentiment(text)
+        relevance = sentiment_analyzer._calculate_relevance_score(text, "AAPL")
+        keywords = sentiment_analyzer._extract_financial_keywords(text)
+        
+        assert sentiment == sentiment_analyzer._analyze_text_sentiment(preprocessed)
+        assert relevance == sentiment_analyzer._calculate_relevance_score(preprocessed, "AAPL")
+        assert keywords == sentiment_analyzer._extract_financial_keywords(preprocessed)
+    
     def test_analyze_news_sentiment(self, sentiment_analyzer, sample_news_items):
         """Test news sentiment aggregation."""
         sentiment = sentiment_analyzer._analyze_news_sentiment(sample_news_items)
@@ -178,21 +203,21 @@ class TestSentimentAnalyzer:
     
     def test_calculate_overall_sentiment(self, sentiment_analyzer):
         """Test overall sentiment calculation."""
-        news_sentiment = Decimal('0.6')
-        social_sentiment = Decimal('0.4')
+        news_sentiment = 0.6
+        social_sentiment = 0.4
         
         overall = sentiment_analyzer._calculate_overall_sentiment(
             news_sentiment, social_sentiment, 5, 3
         )
         
         # Should be weighted average (0.7 * 0.6 + 0.3 * 0.4)
-        expected = Decimal('0.54')  # 0.42 + 0.12
-        assert abs(overall - expected) < Decimal('0.1')
+        expected = 0.54  # 0.42 + 0.12
+        assert abs(overall - expected) < 0.1
     
     def test_calculate_overall_sentiment_news_only(self, sentiment_analyzer):
         """Test overall sentiment with only news data."""
-        news_sentiment = Decimal('0.5')
-        social_sentiment = Decimal('0')
+        news_sentiment = 0.5
+        social_sentiment = 0.0
         
         overall = sentiment_analyzer._calculate_overall_sentiment(
             news_sentiment, social_sentiment, 5, 0
@@ -202,11 +227,12 @@ class TestSentimentAnalyzer:
     
     def test_analyze_sentiment_trend_improving(self, sentiment_analyzer, sample_news_items):
         """Test sentiment trend analysis for improving trend."""
-        # Modify timestamps to create improving trend
-        sample_news_items[0].published_at = datetime.now() - timedelta(hours=1)  # Recent positive
-        sample_news_items[1].published_at = datetime.now() - timedelta(days=3)   # Older negative
+        # Modify timestamps on copies to create improving trend
+        news_items = [item.model_copy() for item in sample_news_items]
+        news_items[0].published_at = datetime.now() - timedelta(hours=1)  # Recent positive
+        news_items[1].published_at = datetime.now() - timedelta(days=3)   # Older negative
         
-        direction, strength = sentiment_analyzer._analyze_sentiment_trend(sample_news_items)
+        direction, strength = sentiment_analyzer._analyze_sentiment_trend(news_items)
         
         assert direction == TrendDirection.IMPROVING
         assert strength > 0
@@ -339,10 +365,9 @@ class TestSentimentAnalyzer:
         
         assert len(alerts) == 0
     
-    @pytest.mark.asyncio
-    async def test_detect_sentiment_conflicts_bullish_sentiment_bearish_fundamentals(self, sentiment_analyzer):
+    def test_detect_sentiment_conflicts_bullish_sentiment_bearish_fundamentals(self, sentiment_analyzer):
         """Test conflict detection for bullish sentiment vs bearish fundamentals."""
-        conflicts = await sentiment_analyzer.detect_sentiment_conflicts(
+        conflicts = sentiment_analyzer.detect_sentiment_conflicts(
             "AAPL", Decimal('0.7'), Decimal('-0.6')
         )
         
@@ -351,10 +376,9 @@ class TestSentimentAnalyzer:
         assert conflicts[0].symbol == "AAPL"
         assert conflicts[0].conflict_severity > Decimal('0.5')
     
-    @pytest.mark.asyncio
-    async def test_detect_sentiment_conflicts_bearish_sentiment_bullish_fundamentals(self, sentiment_analyzer):
+    def test_detect_sentiment_conflicts_bearish_sentiment_bullish_fundamentals(self, sentiment_analyzer):
         """Test conflict detection for bearish sentiment vs bullish fundamentals."""
-        conflicts = await sentiment_analyzer.detect_sentiment_conflicts(
+        conflicts = sentiment_analyzer.detect_sentiment_conflicts(
             "AAPL", Decimal('-0.7'), Decimal('0.6')
         )
         
@@ -363,10 +387,9 @@ class TestSentimentAnalyzer:
         assert conflicts[0].symbol == "AAPL"
         assert conflicts[0].conflict_severity > Decimal('0.5')
     
-    @pytest.mark.asyncio
-    async def test_detect_sentiment_conflicts_no_conflict(self, sentiment_analyzer):
+    def test_detect_sentiment_conflicts_no_conflict(self, sentiment_analyzer):
         """Test no conflict detection when sentiment and fundamentals align."""
-        conflicts = await sentiment_analyzer.detect_sentiment_conflicts(
+        conflicts = sentiment_analyzer.detect_sentiment_conflicts(
             "AAPL", Decimal('0.6'), Decimal('0.5')
         )
         
@@ -416,7 +439,7 @@ class TestSentimentAnalyzer:
     async def test_fetch_social_data_success(self, mock_reddit, sentiment_analyzer):
         """Test successful social media data fetching."""
         # Mock Reddit response
-        mock_submission = Mock()
+        mock_submission = Mock(spec=Submission)
         mock_submission.id = "test123"
         mock_submission.title = "AAPL to the moon!"
         mock_submission.selftext = "Great earnings, buying more shares"
@@ -487,6 +510,52 @@ class TestSentimentAnalyzer:
         assert SentimentSource.NEWS in result.sentiment_data.sources
         assert SentimentSource.REDDIT not in result.sentiment_data.sources
     
+    @pytest.mark.asyncio
+    @patch('app.services.sentiment_analyzer.SentimentAnalyzer._fetch_news_data')
+    async def test_analyze_stock_sentiment_uses_analysis_cache(
+        self, mock_fetch_news, sentiment_analyzer, sample_news_items
+    ):
+        """Test repeated analyses of the same symbol reuse the cached result."""
+        mock_fetch_news.return_value = sample_news_items
+        
+        first = await sentiment_analyzer.analyze_stock_sentiment("AAPL", include_social=False)
+        second = await sentiment_analyzer.analyze_stock_sentiment("AAPL", include_social=False)
+        
+        assert second == first
+        assert second is not first  # callers get their own copy
+        mock_fetch_news.assert_called_once()
+        
+        await sentiment_analyzer.analyze_stock_sentiment("AAPL", days_back=1, include_social=False)
+        assert mock_fetch_news.call_count == 2
+    
+    def test_analysis_cache_evicts_expired_and_oldest_entries(self, sentiment_analyzer):
+        """Test the analysis cache drops stale entries and stays within its size cap."""
+        result = Mock(spec=SentimentAnalysisResult)
+        stale_at = datetime.now() - timedelta(seconds=sentiment_analyzer.cache_ttl['sentiment_analysis'] + 1)
+        sentiment_analyzer._analysis_cache = {("STALE", 7, True): (stale_at, result)}
+        
+        with patch('app.services.sentiment_analyzer._MAX_ANALYSIS_CACHE_ENTRIES', 3):
+            for symbol in ["A", "B", "C", "D"]:
+                sentiment_analyzer._cache_analysis((symbol, 7, True), result)
+        
+        assert list(sentiment_analyzer._analysis_cache) == [("B", 7, True), ("C", 7, True), ("D", 7, True)]
+    
+    @pytest.mark.asyncio
+    @patch('app.services.sentiment_analyzer.SentimentAnalyzer._fetch_news_data')
+    async def test_analyze_multiple_stock_sentiment(
+        self, mock_fetch_news, sentiment_analyzer, sample_news_items
+    ):
+        """Test bulk sentiment analysis returns one result per distinct symbol."""
+        mock_fetch_news.return_value = sample_news_items
+        
+        results = await sentiment_analyzer.analyze_multiple_stock_sentiment(
+            ["AAPL", "MSFT", "AAPL"], include_social=False
+        )
+        
+        assert list(results) == ["AAPL", "MSFT"]
+        assert all(result.symbol == symbol for symbol, result in results.items())
+        assert mock_fetch_news.call_count == 2
+    
     @pytest.mark.asyncio
     @patch('app.services.sentiment_analyzer.SentimentAnalyzer._fetch_news_data')
     @patch('app.services.sentiment_analyzer.SentimentAnalyzer._fetch_social_data')
@@ -514,7 +583,8 @@ class TestSentimentAnalyzerIntegration:
         analyzer = SentimentAnalyzer()
         
         text = "The company reported strong profit growth and beat earnings expectations"
-        boost = analyzer._calculate_keyword_sentiment_boost(text)
+        preprocessed = analyzer._preprocess_text(text)
+        boost = analyzer._calculate_keyword_sentiment_boost(preprocessed)
         
         assert boost > 0
         assert boost <= 0.2
@@ -525,7 +595,8 @@ class TestSentimentAnalyzerIntegration:
         analyzer = SentimentAnalyzer()
         
         text = "The company faces significant losses and declining performance"
-        boost = analyzer._calculate_keyword_sentiment_boost(text)
+        preprocessed = analyzer._preprocess_text(text)
+        boost = analyzer._calculate_keyword_sentiment_boost(preprocessed)
         
         assert boost < 0
         assert boost >= -0.2
@@ -536,6 +607,7 @@ class TestSentimentAnalyzerIntegration:
         analyzer = SentimentAnalyzer()
         
         text = "The company reported quarterly results"
-        boost = analyzer._calculate_keyword_sentiment_boost(text)
+        preprocessed = analyzer._preprocess_text(text)
+        boost = analyzer._calculate_keyword_sentiment_boost(preprocessed)
         
         assert abs(boost) < 0.1  # Should be minimal boost
\ No newline at end of file
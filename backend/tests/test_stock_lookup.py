@@ -4,70 +4,135 @@ Tests the stock API endpoints and data aggregation service.
 """
 
 import pytest
+import pytest_asyncio
 import asyncio
-from fastapi.testclient import TestClient
+import orjson
+from httpx import AsyncClient, ASGITransport
 from unittest.mock import Mock, patch, AsyncMock
 from decimal import Decimal
 from datetime import datetime
 
 from app.services.data_aggregation import DataAggregationService, DataAggregationException
 from app.models.stock import MarketData, Stock
+from app.api.stocks import get_data_service
 from main import app
 
-client = TestClient(app)
 
+# Fixed timestamp for sample models, so tests don't depend on the clock
+_NOW = datetime(2024, 1, 1, 12)
+
+# Shared Decimal values, parsed once rather than per model construction.
+# Sample models below use model_construct() to skip validation on purpose: they only
+# feed mocks, and the code under test is their consumer, not Pydantic.
+_AAPL_PRICE = Decimal("150.25")
+_AAPL_CHANGE = Decimal("2.50")
+_STUB_PRICE = Decimal("100.00")
+_STUB_CHANGE = Decimal("1.00")
+
+# 51 symbols, one over the batch endpoint's limit
+_OVERSIZED_BATCH = tuple(f"SYM{i}" for i in range(51))
+
+
+@pytest.fixture(scope="module")
+def event_loop():
+    """Share a single event loop across the module instead of one per test."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest_asyncio.fixture(scope="module")
+async def client():
+    """Create an async test client, running app startup/shutdown once per module."""
+    # ASGITransport doesn't send lifespan events, so drive them through the router
+    async with app.router.lifespan_context(app):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://testserver") as test_client:
+            yield test_client
+
+
+@pytest_asyncio.fixture(scope="module")
+async def health_response(client):
+    """Fetch /health once; it's read-only, so tests that need "the API is up" share it."""
+    return await client.get("/health")
+
+
+@pytest.fixture(scope="module")
+def aapl_stock():
+    """Create sample AAPL stock info (read-only, shared by the module)."""
+    return Stock.model_construct(
+        symbol="AAPL",
+        name="Apple Inc.",
+        exchange="NASDAQ",
+        sector="Technology",
+        industry="Consumer Electronics",
+        market_cap=3000000000000,
+        last_updated=_NOW
+    )
+
+
+@pytest.fixture(scope="module")
+def aapl_market_data():
+    """Create sample AAPL market data (read-only, shared by the module)."""
+    return MarketData.model_construct(
+        symbol="AAPL",
+        price=_AAPL_PRICE,
+        change=_AAPL_CHANGE,
+        change_percent=Decimal("1.69"),
+        volume=75000000,
+        high_52_week=Decimal("180.00"),
+        low_52_week=Decimal("120.00"),
+        avg_volume=80000000,
+        market_cap=2500000000000,
+        pe_ratio=Decimal("25.5"),
+        timestamp=_NOW
+    )
+
+
+@pytest.fixture(scope="module")
+def msft_market_data():
+    """Create sample MSFT market data (read-only, shared by the module)."""
+    return MarketData.model_construct(
+        symbol="MSFT",
+        price=Decimal("380.50"),
+        change=Decimal("-1.25"),
+        change_percent=Decimal("-0.33"),
+        volume=25000000,
+        timestamp=_NOW
+    )
+
+
+@pytest.mark.asyncio
 class TestStockLookupAPI:
     """Test stock lookup API endpoints."""
     
-    def test_health_check(self):
+    @pytest.fixture
+    def mock_service(self):
+        """Swap the routes' data service dependency for a mock."""
+        mock_service = AsyncMock(spec=DataAggregationService)
+        app.dependency_overrides[get_data_service] = lambda: mock_service
+        yield mock_service
+        app.dependency_overrides.pop(get_data_service, None)
+    
+    async def test_health_check(self, health_response):
         """Test that the API is running."""
-        response = client.get("/health")
-        assert response.status_code == 200
-        data = response.json()
+        assert health_response.status_code == 200
+        data = orjson.loads(health_response.content)
         assert data["status"] == "healthy"
     
-    @patch('app.api.stocks.DataAggregationService')
-    def test_lookup_stock_success(self, mock_service_class):
+    async def test_lookup_stock_success(
+        self, mock_service, client, aapl_stock, aapl_market_data
+    ):
         """Test successful stock lookup."""
-        # Mock the service instance and its methods
-        mock_service = Mock()
-        mock_service_class.return_value = mock_service
-        
-        # Create mock data
-        mock_stock = Stock(
-            symbol="AAPL",
-            name="Apple Inc.",
-            exchange="NASDAQ",
-            sector="Technology",
-            industry="Consumer Electronics",
-            market_cap=3000000000000,
-            last_updated=datetime.now()
-        )
-        
-        mock_market_data = MarketData(
-            symbol="AAPL",
-            price=Decimal("150.25"),
-            change=Decimal("2.50"),
-            change_percent=Decimal("1.69"),
-            volume=75000000,
-            high_52_week=Decimal("180.00"),
-            low_52_week=Decimal("120.00"),
-            avg_volume=80000000,
-            market_cap=2500000000000,
-            pe_ratio=Decimal("25.5"),
-            timestamp=datetime.now()
-        )
-        
-        # Configure mock methods to return coroutines
-        mock_service.get_stock_info = AsyncMock(return_value=mock_stock)
-        mock_service.get_market_data = AsyncMock(return_value=mock_market_data)
+        # The spec makes the service methods AsyncMocks already
+        mock_service.get_stock_info.return_value = aapl_stock
+        mock_service.get_market_data.return_value = aapl_market_data
         
         # Make request
-        response = client.get("/api/v1/stocks/lookup/AAPL")
+        response = await client.get("/api/v1/stocks/lookup/AAPL")
         
         # Assertions
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
         
         assert "stock" in data
         assert "market_data" in data
@@ -76,141 +141,91 @@ class TestStockLookupAPI:
         assert data["market_data"]["symbol"] == "AAPL"
         assert data["market_data"]["price"] == 150.25
     
-    @patch('app.api.stocks.DataAggregationService')
-    def test_lookup_stock_invalid_symbol(self, mock_service_class):
+    async def test_lookup_stock_invalid_symbol(self, mock_service, client):
         """Test stock lookup with invalid symbol."""
-        mock_service = Mock()
-        mock_service_class.return_value = mock_service
-        
         # Configure mock to raise exception for both methods
-        mock_service.get_stock_info = AsyncMock(
-            side_effect=DataAggregationException(
-                "Stock symbol INVALID not found",
-                error_type="INVALID_SYMBOL",
-                suggestions=["Check symbol spelling", "Verify symbol exists"]
-            )
+        mock_service.get_stock_info.side_effect = DataAggregationException(
+            "Stock symbol INVALID not found",
+            error_type="INVALID_SYMBOL",
+            suggestions=["Check symbol spelling", "Verify symbol exists"]
         )
-        mock_service.get_market_data = AsyncMock(
-            side_effect=DataAggregationException(
-                "Stock symbol INVALID not found",
-                error_type="INVALID_SYMBOL",
-                suggestions=["Check symbol spelling", "Verify symbol exists"]
-            )
+        mock_service.get_market_data.side_effect = DataAggregationException(
+            "Stock symbol INVALID not found",
+            error_type="INVALID_SYMBOL",
+            suggestions=["Check symbol spelling", "Verify symbol exists"]
         )
         
-        response = client.get("/api/v1/stocks/lookup/INVALID")
+        response = await client.get("/api/v1/stocks/lookup/INVALID")
         
         assert response.status_code == 404
-        data = response.json()
+        data = orjson.loads(response.content)
         assert data["error"] == True
         assert data["error_type"] == "INVALID_SYMBOL"
         assert "suggestions" in data
     
-    @patch('app.api.stocks.DataAggregationService')
-    def test_validate_symbol_valid(self, mock_service_class):
+    async def test_validate_symbol_valid(self, mock_service, client):
         """Test symbol validation with valid symbol."""
-        mock_service = Mock()
-        mock_service_class.return_value = mock_service
-        mock_service.validate_symbol = AsyncMock(return_value=True)
+        mock_service.validate_symbol.return_value = True
         
-        response = client.get("/api/v1/stocks/validate/AAPL")
+        response = await client.get("/api/v1/stocks/validate/AAPL")
         
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
         assert data["symbol"] == "AAPL"
         assert data["is_valid"] == True
         assert len(data["suggestions"]) == 0
     
-    @patch('app.api.stocks.DataAggregationService')
-    def test_validate_symbol_invalid(self, mock_service_class):
+    async def test_validate_symbol_invalid(self, mock_service, client):
         """Test symbol validation with invalid symbol."""
-        mock_service = Mock()
-        mock_service_class.return_value = mock_service
-        mock_service.validate_symbol = AsyncMock(
-            side_effect=DataAggregationException(
-                "Symbol not found",
-                error_type="INVALID_SYMBOL",
-                suggestions=["Check spelling"]
-            )
+        mock_service.validate_symbol.side_effect = DataAggregationException(
+            "Symbol not found",
+            error_type="INVALID_SYMBOL",
+            suggestions=["Check spelling"]
         )
         
-        response = client.get("/api/v1/stocks/validate/INVALID")
+        response = await client.get("/api/v1/stocks/validate/INVALID")
         
         assert response.status_code == 200  # Validation endpoint returns 200 even for invalid
-        data = response.json()
+        data = orjson.loads(response.content)
         assert data["symbol"] == "INVALID"
         assert data["is_valid"] == False
         assert len(data["suggestions"]) > 0
     
-    @patch('app.api.stocks.DataAggregationService')
-    def test_get_market_data(self, mock_service_class):
+    async def test_get_market_data(self, mock_service, client, aapl_market_data):
         """Test market data endpoint."""
-        mock_service = Mock()
-        mock_service_class.return_value = mock_service
-        
-        mock_market_data = MarketData(
-            symbol="AAPL",
-            price=Decimal("150.25"),
-            change=Decimal("2.50"),
-            change_percent=Decimal("1.69"),
-            volume=75000000,
-            timestamp=datetime.now()
-        )
-        
-        mock_service.get_market_data = AsyncMock(return_value=mock_market_data)
+        mock_service.get_market_data.return_value = aapl_market_data
         
-        response = client.get("/api/v1/stocks/market-data/AAPL")
+        response = await client.get("/api/v1/stocks/market-data/AAPL")
         
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
         assert data["symbol"] == "AAPL"
         assert data["price"] == 150.25
         assert data["change"] == 2.50
     
-    @patch('app.api.stocks.DataAggregationService')
-    def test_batch_market_data(self, mock_service_class):
+    async def test_batch_market_data(
+        self, mock_service, client, aapl_market_data, msft_market_data
+    ):
         """Test batch market data endpoint."""
-        mock_service = Mock()
-        mock_service_class.return_value = mock_service
+        mock_results = {"AAPL": aapl_market_data, "MSFT": msft_market_data}
         
-        mock_results = {
-            "AAPL": MarketData(
-                symbol="AAPL",
-                price=Decimal("150.25"),
-                change=Decimal("2.50"),
-                change_percent=Decimal("1.69"),
-                volume=75000000,
-                timestamp=datetime.now()
-            ),
-            "MSFT": MarketData(
-                symbol="MSFT",
-                price=Decimal("380.50"),
-                change=Decimal("-1.25"),
-                change_percent=Decimal("-0.33"),
-                volume=25000000,
-                timestamp=datetime.now()
-            )
-        }
-        
-        mock_service.get_multiple_market_data = AsyncMock(return_value=mock_results)
+        mock_service.get_multiple_market_data.return_value = mock_results
         
-        response = client.post("/api/v1/stocks/batch/market-data", json=["AAPL", "MSFT"])
+        response = await client.post("/api/v1/stocks/batch/market-data", json=["AAPL", "MSFT"])
         
         assert response.status_code == 200
-        data = response.json()
+        data = orjson.loads(response.content)
         assert "AAPL" in data
         assert "MSFT" in data
         assert data["AAPL"]["symbol"] == "AAPL"
         assert data["MSFT"]["symbol"] == "MSFT"
     
-    def test_batch_market_data_too_many_symbols(self):
+    async def test_batch_market_data_too_many_symbols(self, client):
         """Test batch endpoint with too many symbols."""
-        symbols = [f"SYM{i}" for i in range(51)]  # 51 symbols, over the limit
-        
-        response = client.post("/api/v1/stocks/batch/market-data", json=symbols)
+        response = await client.post("/api/v1/stocks/batch/market-data", json=_OVERSIZED_BATCH)
         
         assert response.status_code == 400
-        data = response.json()
+        data = orjson.loads(response.content)
         # The error response structure is different - it's directly in the response
         assert "Too many symbols" in data["message"]
 
@@ -218,23 +233,22 @@ class TestStockLookupAPI:
 class TestDataAggregationService:
     """Test the data aggregation service directly."""
     
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def service(self):
-        """Create a service instance for testing."""
+        """Create a service instance shared by the class (tests patch, never mutate it)."""
         return DataAggregationService(redis_client=None)  # No Redis for tests
     
-    @pytest.mark.asyncio
-    async def test_symbol_format_validation(self, service):
+    @pytest.mark.parametrize("sym,expected", [
+        ("AAPL", True),
+        ("BRK.A", True),
+        ("GOOGL", True),
+        ("", False),
+        ("A" * 11, False),  # Too long
+        ("AAPL@", False),  # Invalid character
+    ], ids=["aapl", "class_share", "five_letters", "empty", "too_long", "invalid_char"])
+    def test_symbol_format_validation(self, service, sym, expected):
         """Test symbol format validation."""
-        # Valid formats
-        assert service._is_valid_symbol_format("AAPL")
-        assert service._is_valid_symbol_format("BRK.A")
-        assert service._is_valid_symbol_format("GOOGL")
-        
-        # Invalid formats
-        assert not service._is_valid_symbol_format("")
-        assert not service._is_valid_symbol_format("A" * 11)  # Too long
-        assert not service._is_valid_symbol_format("AAPL@")  # Invalid character
+        assert service._is_valid_symbol_format(sym) is expected
     
     @pytest.mark.asyncio
     @patch('yfinance.Ticker')
@@ -264,8 +278,8 @@ class TestDataAggregationService:
         
         assert isinstance(result, MarketData)
         assert result.symbol == "AAPL"
-        assert result.price == Decimal("150.25")
-        assert result.change == Decimal("2.50")
+        assert result.price == _AAPL_PRICE
+        assert result.change == _AAPL_CHANGE
     
     @pytest.mark.asyncio
     @patch('yfinance.Ticker')
@@ -291,18 +305,10 @@ class TestDataAggregationService:
     
     @pytest.mark.asyncio
     @patch.object(DataAggregationService, 'get_market_data')
-    async def test_validate_symbol_api_call(self, mock_get_market_data, service):
+    async def test_validate_symbol_api_call(self, mock_get_market_data, service, aapl_market_data):
         """Test symbol validation makes correct API call."""
         # Mock successful market data fetch
-        mock_market_data = MarketData(
-            symbol="AAPL",
-            price=Decimal("150.25"),
-            change=Decimal("2.50"),
-            change_percent=Decimal("1.69"),
-            volume=75000000,
-            timestamp=datetime.now()
-        )
-        mock_get_market_data.return_value = mock_market_data
+        mock_get_market_data.return_value = aapl_market_data
         
         result = await service.validate_symbol("AAPL")
         
@@ -314,17 +320,26 @@ class TestDataAggregationService:
         """Test fetching multiple market data concurrently."""
         symbols = ["AAPL", "MSFT", "INVALID"]
         
-        # Mock the _safe_get_market_data method
+        # Mock the _safe_get_market_data method, tracking how many calls overlap
+        in_flight = 0
+        max_in_flight = 0
+        
         async def mock_safe_get(symbol):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            
             if symbol == "INVALID":
                 return None
-            return MarketData(
+            return MarketData.model_construct(
                 symbol=symbol,
-                price=Decimal("100.00"),
-                change=Decimal("1.00"),
-                change_percent=Decimal("1.00"),
+                price=_STUB_PRICE,
+                change=_STUB_CHANGE,
+                change_percent=_STUB_CHANGE,
                 volume=1000000,
-                timestamp=datetime.now()
+                timestamp=_NOW
             )
         
         with patch.object(service, '_safe_get_market_data', side_effect=mock_safe_get):
@@ -334,33 +349,40 @@ class TestDataAggregationService:
         assert "AAPL" in results
         assert "MSFT" in results
         assert "INVALID" not in results
+        # A sequential implementation would never have two fetches in flight
+        assert max_in_flight >= 2
 
 
+@pytest.mark.integration
+@pytest.mark.external
+@pytest.mark.asyncio
 class TestStockLookupIntegration:
     """Integration tests for the complete stock lookup workflow."""
     
-    def test_complete_stock_lookup_workflow(self):
+    async def test_complete_stock_lookup_workflow(self, client, health_response):
         """Test the complete workflow from API request to response."""
+        assert health_response.status_code == 200
+        
         # This test would require a real yfinance connection
         # For now, we'll test with a known stable symbol
         
         # Test validation first
-        response = client.get("/api/v1/stocks/validate/AAPL")
+        response = await client.get("/api/v1/stocks/validate/AAPL")
         assert response.status_code == 200
         
         # Note: Actual integration with yfinance would be tested in a separate
         # integration test suite that runs against real APIs
     
-    def test_error_handling_workflow(self):
+    async def test_error_handling_workflow(self, client):
         """Test error handling in the complete workflow."""
         # Test with clearly invalid symbol
-        response = client.get("/api/v1/stocks/lookup/THISISNOTAVALIDSTOCKSYMBOL123")
+        response = await client.get("/api/v1/stocks/lookup/THISISNOTAVALIDSTOCKSYMBOL123")
         
         # Should return 404 or 503 depending on the error
         assert response.status_code in [404, 503]
         
         if response.status_code == 404:
-            data = response.json()
+            data = orjson.loads(response.content)
             # The error response structure is different
             assert data["error"] == True
             assert "suggestions" in data